@@ -1,7 +1,12 @@
-from flask import Blueprint, render_template, session, redirect, url_for, jsonify, request
+from flask import Blueprint, render_template, session, redirect, url_for, jsonify, request, current_app
 import datetime
-import csv
-import io
+import os
+
+from sqlalchemy.exc import IntegrityError
+
+from events import user_tiers_changed
+from quote_cache import LRUCacheBackend, MISSING
+from stock_catalog import stock_catalog
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -12,145 +17,6 @@ def require_admin_session():
         return False
     return True
 
-# Mock data for admin functionality
-MOCK_USERS = [
-    {
-        'id': '1',
-        'email': 'admin@tradinggrow.com',
-        'full_name': 'Admin User',
-        'subscription_tier': 'pro',
-        'is_admin': True,
-        'created_at': '2024-01-01T00:00:00Z'
-    },
-    {
-        'id': '2',
-        'email': 'demo@tradinggrow.com',
-        'full_name': 'Demo User',
-        'subscription_tier': 'pro',
-        'is_admin': False,
-        'created_at': '2024-01-15T00:00:00Z'
-    },
-    {
-        'id': '3',
-        'email': 'user1@example.com',
-        'full_name': 'John Smith',
-        'subscription_tier': 'medium',
-        'is_admin': False,
-        'created_at': '2024-02-01T00:00:00Z'
-    },
-    {
-        'id': '4',
-        'email': 'user2@example.com',
-        'full_name': 'Jane Doe',
-        'subscription_tier': 'free',
-        'is_admin': False,
-        'created_at': '2024-02-15T00:00:00Z'
-    },
-    {
-        'id': '5',
-        'email': 'user3@example.com',
-        'full_name': 'Bob Wilson',
-        'subscription_tier': 'free',
-        'is_admin': False,
-        'created_at': '2024-03-01T00:00:00Z'
-    }
-]
-
-MOCK_STOCKS = [
-    {
-        'id': '1',
-        'symbol': 'AAPL',
-        'name': 'Apple Inc.',
-        'sector': 'Technology',
-        'industry_type': 'Consumer Electronics',
-        'industry_code': 'TECH001',
-        'price': 175.50,
-        'change_percent': 2.3
-    },
-    {
-        'id': '2',
-        'symbol': 'GOOGL',
-        'name': 'Alphabet Inc.',
-        'sector': 'Technology',
-        'industry_type': 'Internet Services',
-        'industry_code': 'TECH002',
-        'price': 2850.25,
-        'change_percent': -1.2
-    },
-    {
-        'id': '3',
-        'symbol': 'MSFT',
-        'name': 'Microsoft Corporation',
-        'sector': 'Technology',
-        'industry_type': 'Software',
-        'industry_code': 'TECH003',
-        'price': 420.15,
-        'change_percent': 1.8
-    },
-    {
-        'id': '4',
-        'symbol': 'TSLA',
-        'name': 'Tesla Inc.',
-        'sector': 'Consumer',
-        'industry_type': 'Electric Vehicles',
-        'industry_code': 'AUTO001',
-        'price': 245.80,
-        'change_percent': -3.5
-    },
-    {
-        'id': '5',
-        'symbol': 'HD',
-        'name': 'Home Depot Inc.',
-        'sector': 'Wholesale Distributors',
-        'industry_type': 'Home Improvement',
-        'industry_code': 'RETAIL001',
-        'price': 320.45,
-        'change_percent': 1.5
-    },
-    {
-        'id': '6',
-        'symbol': 'LOW',
-        'name': 'Lowe\'s Companies',
-        'sector': 'Wholesale Distributors',
-        'industry_type': 'Home Improvement',
-        'industry_code': 'RETAIL002',
-        'price': 225.80,
-        'change_percent': 0.8
-    },
-    {
-        'id': '7',
-        'symbol': 'JPM',
-        'name': 'JPMorgan Chase',
-        'sector': 'Financials',
-        'industry_type': 'Banking',
-        'industry_code': 'FIN001',
-        'price': 145.30,
-        'change_percent': -0.5
-    },
-    {
-        'id': '8',
-        'symbol': 'BAC',
-        'name': 'Bank of America',
-        'sector': 'Financials',
-        'industry_type': 'Banking',
-        'industry_code': 'FIN002',
-        'price': 35.75,
-        'change_percent': 1.2
-    }
-]
-
-MOCK_SUBSCRIPTION_REQUESTS = [
-    {
-        'id': '1',
-        'user_id': '3',
-        'user_name': 'John Smith',
-        'user_email': 'user1@example.com',
-        'current_tier': 'medium',
-        'requested_tier': 'pro',
-        'created_at': '2024-03-15T10:00:00Z'
-    }
-]
-
 @admin_bp.route('/admin/login')
 def admin_login():
     """Admin login page"""
@@ -184,14 +50,17 @@ def admin_dashboard_data():
     if not require_admin_session():
         return jsonify({'error': 'Unauthorized'}), 401
     
+    from models import User
+    tier_counts = User.get_tier_counts()
+    
     return jsonify({
         'success': True,
         'data': {
             'stats': {
-                'total_users': len(MOCK_USERS),
-                'pro_users': len([u for u in MOCK_USERS if u['subscription_tier'] == 'pro']),
-                'medium_users': len([u for u in MOCK_USERS if u['subscription_tier'] == 'medium']),
-                'free_users': len([u for u in MOCK_USERS if u['subscription_tier'] == 'free']),
+                'total_users': sum(tier_counts.values()),
+                'pro_users': tier_counts['pro'],
+                'medium_users': tier_counts['medium'],
+                'free_users': tier_counts['free'],
                 'total_screenings': 89
             },
             'screenings': [
@@ -211,37 +80,110 @@ def admin_dashboard_data():
         }
     })
 
+# Tier filter values accepted by the user listing and count endpoints
+SUBSCRIPTION_TIERS = ('free', 'medium', 'pro')
+# How long a user count stays cached; counting is a full index scan on large tables
+USER_COUNT_CACHE_SECONDS = float(os.getenv('USER_COUNT_CACHE_SECONDS', 30))
+
+_user_count_cache = LRUCacheBackend(max_entries=256)
+
+def user_filters_from_request():
+    """Read the tier and email-prefix filters (raises ValueError for an unknown tier)"""
+    tier = request.args.get('tier') or None
+    if tier and tier not in SUBSCRIPTION_TIERS:
+        raise ValueError(f'Invalid subscription tier: {tier}')
+    return tier, request.args.get('email') or None
+
+def get_users_page():
+    """One keyset page of users for the current request's cursor, limit and filters"""
+    from models import User
+    from pagination import paginate_keyset, page_limit
+    
+    tier, email_prefix = user_filters_from_request()
+    return paginate_keyset(
+        User.filtered_query(tier, email_prefix),
+        (User.created_at, User.id),
+        cursor=request.args.get('cursor'),
+        limit=page_limit(request.args.get('limit', type=int))
+    )
+
+def count_users(tier=None, email_prefix=None):
+    """Number of users matching the filters, cached briefly per filter combination"""
+    from models import User
+    
+    key = f"{tier}:{email_prefix}"
+    count = _user_count_cache.get(key)
+    if count is MISSING:
+        count = User.filtered_query(tier, email_prefix).order_by(None).count()
+        _user_count_cache.set(key, count, USER_COUNT_CACHE_SECONDS)
+    return count
+
+def invalidate_user_counts():
+    """Drop cached counts after a write in this worker (others expire on their TTL)"""
+    _user_count_cache.clear()
+
+@user_tiers_changed.connect
+def _on_user_tiers_changed(sender, **kwargs):
+    invalidate_user_counts()
+
 @admin_bp.route('/admin/api/users')
 def get_all_users():
-    """Get all users for admin management"""
+    """Get a page of users for admin management (?cursor=&limit=&tier=&email=)"""
     if not require_admin_session():
         return jsonify({'error': 'Unauthorized'}), 401
     
+    try:
+        users, next_cursor = get_users_page()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     return jsonify({
         'success': True,
-        'users': MOCK_USERS
+        'users': [user.to_dict() for user in users],
+        'next_cursor': next_cursor
     })
 
+@admin_bp.route('/admin/api/users/count')
+def get_user_count():
+    """Count users matching the listing filters"""
+    if not require_admin_session():
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    try:
+        tier, email_prefix = user_filters_from_request()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'success': True, 'count': count_users(tier, email_prefix)})
+
 @admin_bp.route('/admin/api/users/<user_id>', methods=['PUT'])
 def update_user(user_id):
     """Update user information"""
     if not require_admin_session():
         return jsonify({'error': 'Unauthorized'}), 401
     
+    from models import User
     data = request.get_json()
     
-    # Find and update user in mock data
-    for user in MOCK_USERS:
-        if user['id'] == user_id:
-            user.update({
-                'email': data.get('email', user['email']),
-                'full_name': data.get('full_name', user['full_name']),
-                'subscription_tier': data.get('subscription_tier', user['subscription_tier']),
-                'is_admin': data.get('is_admin', user['is_admin'])
-            })
-            return jsonify({'success': True, 'message': 'User updated successfully'})
+    user = User.get(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    tier = data.get('subscription_tier', user.subscription_tier)
+    if tier not in SUBSCRIPTION_TIERS:
+        return jsonify({'error': f'Invalid subscription tier: {tier}'}), 400
     
-    return jsonify({'error': 'User not found'}), 404
+    user.email = data.get('email', user.email)
+    user.full_name = data.get('full_name', user.full_name)
+    user.subscription_tier = tier
+    user.is_admin = bool(data.get('is_admin', user.is_admin))
+    try:
+        user.save()
+    except IntegrityError:
+        return jsonify({'error': 'Email is already in use'}), 400
+    invalidate_user_counts()
+    
+    return jsonify({'success': True, 'message': 'User updated successfully'})
 
 @admin_bp.route('/admin/api/users/<user_id>', methods=['DELETE'])
 def delete_user(user_id):
@@ -249,8 +191,19 @@ def delete_user(user_id):
     if not require_admin_session():
         return jsonify({'error': 'Unauthorized'}), 401
     
-    global MOCK_USERS
-    MOCK_USERS = [u for u in MOCK_USERS if u['id'] != user_id]
+    from app import db
+    from models import User, SubscriptionRequest
+    
+    user = User.get(user_id)
+    if user:
+        try:
+            SubscriptionRequest.query.filter_by(user_id=user.id).delete(synchronize_session=False)
+            db.session.delete(user)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            return jsonify({'error': 'User could not be deleted'}), 400
+        invalidate_user_counts()
     
     return jsonify({'success': True, 'message': 'User deleted successfully'})
 
@@ -260,26 +213,84 @@ def update_user_subscription(user_id):
     if not require_admin_session():
         return jsonify({'error': 'Unauthorized'}), 401
     
+    from models import User
     data = request.get_json()
     new_tier = data.get('subscription_tier')
     
-    # Find and update user subscription
-    for user in MOCK_USERS:
-        if user['id'] == user_id:
-            user['subscription_tier'] = new_tier
-            return jsonify({'success': True, 'message': f'Subscription updated to {new_tier}'})
+    if new_tier not in SUBSCRIPTION_TIERS:
+        return jsonify({'error': f'Invalid subscription tier: {new_tier}'}), 400
     
-    return jsonify({'error': 'User not found'}), 404
+    user = User.get(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    user.update_subscription(new_tier)
+    invalidate_user_counts()
+    return jsonify({'success': True, 'message': f'Subscription updated to {new_tier}'})
 
 @admin_bp.route('/admin/api/subscription-requests')
 def get_subscription_requests():
-    """Get all pending subscription requests"""
+    """Get a page of pending subscription requests, newest first (?cursor=&limit=)"""
+    if not require_admin_session():
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    from models import SubscriptionRequest
+    from pagination import page_limit
+    
+    try:
+        requests, next_cursor = SubscriptionRequest.get_pending_page(
+            request.args.get('cursor'), page_limit(request.args.get('limit', type=int))
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'success': True,
+        'requests': [req.to_dict() for req in requests],
+        'next_cursor': next_cursor
+    })
+
+# Most request ids accepted by one batch approve/reject call
+SUBSCRIPTION_BATCH_MAX_IDS = int(os.getenv('SUBSCRIPTION_BATCH_MAX_IDS', 5000))
+
+def subscription_batch_from_request():
+    """(request_ids, action) from a batch JSON body (raises ValueError if it is invalid)"""
+    data = request.get_json(silent=True) or {}
+    request_ids = data.get('ids')
+    action = data.get('action')
+    
+    if action not in ('approve', 'reject'):
+        raise ValueError("action must be 'approve' or 'reject'")
+    if not isinstance(request_ids, list) or not request_ids or not all(isinstance(i, str) for i in request_ids):
+        raise ValueError('ids must be a non-empty list of request ids')
+    if len(request_ids) > SUBSCRIPTION_BATCH_MAX_IDS:
+        raise ValueError(f'At most {SUBSCRIPTION_BATCH_MAX_IDS} ids per batch')
+    return request_ids, action
+
+@admin_bp.route('/admin/api/subscription-requests/batch', methods=['POST'])
+def handle_subscription_requests_batch():
+    """Approve or reject a list of subscription requests in one transaction"""
     if not require_admin_session():
         return jsonify({'error': 'Unauthorized'}), 401
     
+    from models import SubscriptionRequest
+    
+    try:
+        request_ids, action = subscription_batch_from_request()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        resolved_ids = SubscriptionRequest.resolve_many(request_ids, action)
+    except Exception as e:
+        return jsonify({'error': f'Failed to process requests: {str(e)}'}), 500
+    
+    resolved = set(resolved_ids)
     return jsonify({
         'success': True,
-        'requests': MOCK_SUBSCRIPTION_REQUESTS
+        'message': f"{len(resolved_ids)} subscription requests {'approved' if action == 'approve' else 'rejected'}",
+        'resolved_ids': resolved_ids,
+        'skipped_ids': [request_id for request_id in dict.fromkeys(request_ids) if request_id not in resolved]
     })
 
 @admin_bp.route('/admin/api/subscription-requests/<request_id>/<action>', methods=['POST'])
@@ -288,36 +299,22 @@ def handle_subscription_request(request_id, action):
     if not require_admin_session():
         return jsonify({'error': 'Unauthorized'}), 401
     
-    global MOCK_SUBSCRIPTION_REQUESTS
-    
-    # Find the request
-    request_obj = None
-    for req in MOCK_SUBSCRIPTION_REQUESTS:
-        if req['id'] == request_id:
-            request_obj = req
-            break
+    from models import SubscriptionRequest
     
-    if not request_obj:
+    request_obj = SubscriptionRequest.query.get(request_id)
+    if not request_obj or request_obj.status != 'pending':
         return jsonify({'error': 'Request not found'}), 404
     
     if action == 'approve':
-        # Update user subscription
-        for user in MOCK_USERS:
-            if user['id'] == request_obj['user_id']:
-                user['subscription_tier'] = request_obj['requested_tier']
-                break
-        
-        # Remove request
-        MOCK_SUBSCRIPTION_REQUESTS = [r for r in MOCK_SUBSCRIPTION_REQUESTS if r['id'] != request_id]
+        request_obj.approve()
         
         return jsonify({
             'success': True, 
-            'message': f"Subscription upgraded to {request_obj['requested_tier']}"
+            'message': f"Subscription upgraded to {request_obj.requested_tier}"
         })
     
     elif action == 'reject':
-        # Remove request
-        MOCK_SUBSCRIPTION_REQUESTS = [r for r in MOCK_SUBSCRIPTION_REQUESTS if r['id'] != request_id]
+        request_obj.reject()
         
         return jsonify({
             'success': True,
@@ -332,15 +329,21 @@ def bulk_upgrade_users():
     if not require_admin_session():
         return jsonify({'error': 'Unauthorized'}), 401
     
-    data = request.get_json()
+    from models import User
+    
+    data = request.get_json() or {}
     from_tier = data.get('from_tier')
     to_tier = data.get('to_tier')
     
-    updated_count = 0
-    for user in MOCK_USERS:
-        if user['subscription_tier'] == from_tier and not user.get('is_admin', False):
-            user['subscription_tier'] = to_tier
-            updated_count += 1
+    if from_tier not in SUBSCRIPTION_TIERS or to_tier not in SUBSCRIPTION_TIERS:
+        return jsonify({'error': 'from_tier and to_tier must be valid subscription tiers'}), 400
+    if from_tier == to_tier:
+        return jsonify({'error': 'from_tier and to_tier must differ'}), 400
+    
+    try:
+        updated_count = User.bulk_update_tier(from_tier, to_tier)
+    except Exception as e:
+        return jsonify({'error': f'Bulk upgrade failed: {str(e)}'}), 500
     
     return jsonify({
         'success': True,
@@ -351,38 +354,20 @@ def bulk_upgrade_users():
 @admin_bp.route('/admin/api/stocks', methods=['GET'])
 def get_all_stocks():
     """Get all stocks for management"""
-    return jsonify({
+    from http_cache import make_etag, conditional_response
+    return conditional_response(make_etag('admin-stocks', stock_catalog.version()), lambda: jsonify({
         'success': True,
-        'stocks': MOCK_STOCKS
-    })
+        'stocks': stock_catalog.all()
+    }))
 
 @admin_bp.route('/admin/api/stocks/by-industry', methods=['GET'])
 def get_stocks_by_industry():
     """Get stocks organized by industry"""
-    industry_groups = {}
-    
-    for stock in MOCK_STOCKS:
-        industry_type = stock.get('industry_type', 'Other')
-        industry_code = stock.get('industry_code', 'N/A')
-        sector = stock.get('sector', 'Other')
-        
-        # Group by sector first, then by industry type
-        if sector not in industry_groups:
-            industry_groups[sector] = {}
-        
-        if industry_type not in industry_groups[sector]:
-            industry_groups[sector][industry_type] = {
-                'industry_code': industry_code,
-                'stocks': []
-            }
-        
-        industry_groups[sector][industry_type]['stocks'].append(stock)
-    
-    return jsonify({
-        'success': True,
-        'industries': industry_groups,
-        'total_stocks': len(MOCK_STOCKS)
-    })
+    from http_cache import make_etag, conditional_response
+    return conditional_response(
+        make_etag('admin-by-industry', stock_catalog.version()),
+        lambda: current_app.response_class(stock_catalog.index.admin_json(), mimetype='application/json')
+    )
 
 @admin_bp.route('/admin/api/stocks', methods=['POST'])
 def add_stock():
@@ -390,23 +375,28 @@ def add_stock():
     if not require_admin_session():
         return jsonify({'error': 'Unauthorized'}), 401
     
+    from models import Stock
     data = request.get_json()
+    symbol = data.get('symbol', '').upper()
+    
+    if not symbol:
+        return jsonify({'error': 'Symbol is required'}), 400
     
-    new_stock = {
-        'id': str(len(MOCK_STOCKS) + 1),
-        'symbol': data.get('symbol', '').upper(),
-        'name': data.get('name', ''),
-        'sector': data.get('sector', ''),
-        'price': float(data.get('price', 0)),
-        'change_percent': float(data.get('change_percent', 0))
-    }
+    if stock_catalog.get(symbol) or Stock.get_by_symbol(symbol):
+        return jsonify({'error': f'Stock {symbol} already exists'}), 400
     
-    MOCK_STOCKS.append(new_stock)
+    new_stock = Stock(
+        symbol, data.get('name', ''),
+        sector=data.get('sector', ''),
+        price=float(data.get('price', 0)),
+        change_percent=float(data.get('change_percent', 0))
+    ).save()
+    stock_catalog.upsert(new_stock.to_dict())
     
     return jsonify({
         'success': True,
         'message': 'Stock added successfully',
-        'stock': new_stock
+        'stock': new_stock.to_dict()
     })
 
 @admin_bp.route('/admin/api/stocks/<stock_id>', methods=['DELETE'])
@@ -415,8 +405,11 @@ def delete_stock(stock_id):
     if not require_admin_session():
         return jsonify({'error': 'Unauthorized'}), 401
     
-    global MOCK_STOCKS
-    MOCK_STOCKS = [s for s in MOCK_STOCKS if s['id'] != stock_id]
+    from models import Stock
+    stock = Stock.get(stock_id)
+    if stock:
+        stock.delete()
+        stock_catalog.remove(stock_id)
     
     return jsonify({
         'success': True,
@@ -429,19 +422,23 @@ def update_stock_price(stock_id):
     if not require_admin_session():
         return jsonify({'error': 'Unauthorized'}), 401
     
+    from models import Stock
     data = request.get_json()
     new_price = float(data.get('price', 0))
     
-    for stock in MOCK_STOCKS:
-        if stock['id'] == stock_id:
-            old_price = stock['price']
-            stock['price'] = new_price
-            # Calculate change percentage
-            if old_price > 0:
-                stock['change_percent'] = ((new_price - old_price) / old_price) * 100
-            return jsonify({'success': True, 'message': 'Stock price updated'})
+    stock = Stock.get(stock_id)
+    if not stock:
+        return jsonify({'error': 'Stock not found'}), 404
     
-    return jsonify({'error': 'Stock not found'}), 404
+    old_price = stock.price or 0
+    stock.price = new_price
+    # Calculate change percentage
+    if old_price > 0:
+        stock.change_percent = ((new_price - old_price) / old_price) * 100
+    stock.save()
+    stock_catalog.upsert(stock.to_dict())
+    
+    return jsonify({'success': True, 'message': 'Stock price updated'})
 
 @admin_bp.route('/admin/api/stocks/bulk-upload', methods=['POST'])
 def bulk_upload_stocks():
@@ -459,74 +456,37 @@ def bulk_upload_stocks():
     if not file.filename or not file.filename.endswith('.csv'):
         return jsonify({'error': 'File must be a CSV file'}), 400
     
+    from import_jobs import import_job_runner
+    
     try:
-        # Read CSV file content
-        stream = io.StringIO(file.stream.read().decode("UTF8"), newline=None)
-        csv_reader = csv.DictReader(stream)
-        
-        processed_count = 0
-        error_count = 0
-        errors = []
-        
-        global MOCK_STOCKS
-        
-        for row_num, row in enumerate(csv_reader, start=2):  # Start from 2 to account for header
-            try:
-                # Validate required fields
-                required_fields = ['symbol', 'name', 'sector', 'price']
-                missing_fields = [field for field in required_fields if not row.get(field, '').strip()]
-                
-                if missing_fields:
-                    error_count += 1
-                    errors.append(f"Row {row_num}: Missing required fields: {', '.join(missing_fields)}")
-                    continue
-                
-                # Process the stock data
-                stock_data = {
-                    'id': str(len(MOCK_STOCKS) + processed_count + 1),
-                    'symbol': row['symbol'].strip().upper(),
-                    'name': row['name'].strip(),
-                    'sector': row['sector'].strip(),
-                    'industry_type': row.get('industry_type', '').strip(),
-                    'industry_code': row.get('industry_code', '').strip(),
-                    'price': float(row['price']),
-                    'change_percent': float(row.get('change_percent', 0))
-                }
-                
-                # Check for duplicate symbols
-                existing_stock = next((s for s in MOCK_STOCKS if s['symbol'] == stock_data['symbol']), None)
-                if existing_stock:
-                    # Update existing stock
-                    existing_stock.update(stock_data)
-                    existing_stock['id'] = existing_stock['id']  # Keep original ID
-                else:
-                    # Add new stock
-                    MOCK_STOCKS.append(stock_data)
-                
-                processed_count += 1
-                
-            except ValueError as e:
-                error_count += 1
-                errors.append(f"Row {row_num}: Invalid data format - {str(e)}")
-            except Exception as e:
-                error_count += 1
-                errors.append(f"Row {row_num}: Error processing row - {str(e)}")
-        
-        # Prepare response
-        response_data = {
-            'success': True,
-            'message': f'CSV processed successfully! {processed_count} stocks processed.',
-            'processed': processed_count,
-            'errors': error_count,
-            'total_stocks': len(MOCK_STOCKS)
-        }
-        
-        if errors:
-            response_data['error_details'] = errors[:10]  # Limit to first 10 errors
-            
-        return jsonify(response_data)
-        
+        # Large listings outlive a request; the import runs in the background
+        job = import_job_runner.submit_stock_csv(current_app._get_current_object(), file)
     except Exception as e:
         return jsonify({
             'error': f'Failed to process CSV file: {str(e)}'
-        }), 500
\ No newline at end of file
+        }), 500
+    
+    return jsonify({
+        'success': True,
+        'message': 'CSV upload accepted for import',
+        'job': job.to_dict(),
+        'status_url': url_for('admin.get_import_job', job_id=job.id)
+    }), 202
+
+@admin_bp.route('/admin/api/import-jobs/<job_id>', methods=['GET'])
+def get_import_job(job_id):
+    """Get progress, row counts and the first errors of a bulk import"""
+    if not require_admin_session():
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    from import_jobs import IMPORT_JOB_STALE_SECONDS
+    from models import ImportJob
+    job = ImportJob.get(job_id)
+    if not job:
+        return jsonify({'error': 'Import job not found'}), 404
+    
+    # A worker restart mid-import leaves the row queued/running forever; report it as failed
+    job.expire_if_stale(IMPORT_JOB_STALE_SECONDS)
+    
+    max_errors = max(0, min(request.args.get('errors', 10, type=int), 100))
+    return jsonify({'success': True, 'job': job.to_dict(max_errors=max_errors)})
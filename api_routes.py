@@ -1,13 +1,19 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, Response, current_app, request, jsonify, session
 from werkzeug.security import check_password_hash, generate_password_hash
 from flask_login import login_user, logout_user, current_user, login_required
 from app import db
 from models import User
-import uuid
-from collections import defaultdict
+from http_cache import make_etag, conditional_response
 
 api = Blueprint('api', __name__, url_prefix='/api')
 
+# Accept type clients can send to receive time series as parallel arrays
+COLUMNAR_MIMETYPE = 'application/vnd.tradinggrow.columnar+json'
+
+def wants_columnar():
+    """Clients opt into columnar time series with ?format=columnar or the columnar Accept type"""
+    return request.args.get('format') == 'columnar' or COLUMNAR_MIMETYPE in request.headers.get('Accept', '')
+
 @api.route('/auth/me', methods=['GET'])
 def get_current_user():
     """Get current user data"""
@@ -22,21 +28,18 @@ def get_current_user():
         }
         
         # Get watchlists and sector data
-        try:
-            from financial_data_service import financial_service
-            from data_service import get_watchlists_for_user
-            watchlists = get_watchlists_for_user(current_user.id)
-            sector_data = financial_service.get_sector_performance()
-        except ImportError:
-            # Fallback for testing
-            watchlists = []
-            sector_data = {}
+        from sector_refresher import sector_refresher
+        from data_service import get_watchlists_for_user
+        watchlists = get_watchlists_for_user(current_user.id)
+        snapshot = sector_refresher.snapshot()
         
-        return jsonify({
+        # Watchlists carry live quotes, so they are versioned by content; sectors by snapshot
+        etag = make_etag(user_data, watchlists, snapshot.digest)
+        return conditional_response(etag, lambda: jsonify({
             'user': user_data,
             'watchlists': watchlists,
-            'sectorData': sector_data
-        })
+            'sectorData': snapshot.data
+        }))
     
     # Check for mock authentication session
     mock_user_data = session.get('mock_user_data')
@@ -145,13 +148,9 @@ def api_logout():
 @login_required
 def get_user_data():
     """Get user dashboard data"""
-    try:
-        from data_service import get_watchlists_for_user, get_sector_data
-        watchlists = get_watchlists_for_user(current_user.id)
-        sector_data = get_sector_data()
-    except ImportError:
-        watchlists = []
-        sector_data = {}
+    from data_service import get_watchlists_for_user, get_sector_data, sector_chart_version
+    watchlists = get_watchlists_for_user(current_user.id)
+    columnar = wants_columnar()
     
     user_data = {
         'id': current_user.id,
@@ -161,10 +160,44 @@ def get_user_data():
         'is_admin': current_user.is_admin
     }
     
-    return jsonify({
+    # The sector charts are only generated when the client's copy is out of date
+    etag = make_etag(user_data, watchlists, sector_chart_version(), columnar)
+    response = conditional_response(etag, lambda: jsonify({
         'user': user_data,
         'watchlists': watchlists,
-        'sectorData': sector_data
+        'sectorData': get_sector_data(columnar=columnar)
+    }))
+    response.vary.add('Accept')
+    return response
+
+@api.route('/stream/dashboard', methods=['GET'])
+@login_required
+def stream_dashboard():
+    """Server-Sent Events stream of sector and watchlist quote changes"""
+    import time
+    from models import WatchlistItem
+    from live_updates import live_hub, format_event, LIVE_HEARTBEAT_SECONDS, LIVE_STREAM_MAX_SECONDS
+
+    # Resolve everything that needs the request or database before streaming starts
+    subscription = live_hub.subscribe(WatchlistItem.get_symbols_for_user(current_user.id))
+    db.session.remove()
+
+    def generate():
+        deadline = time.monotonic() + LIVE_STREAM_MAX_SECONDS
+        try:
+            yield 'retry: 5000\n\n'
+            while time.monotonic() < deadline:
+                event = subscription.next_event(timeout=LIVE_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ': keep-alive\n\n'
+                else:
+                    yield format_event(*event)
+        finally:
+            live_hub.unsubscribe(subscription)
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
     })
 
 @api.route('/user/request-subscription', methods=['POST'])
@@ -190,10 +223,9 @@ def request_subscription():
     
     # Create new subscription request
     request_obj = SubscriptionRequest(
-        id=str(uuid.uuid4()),
         user_id=current_user.id,
-        tier=tier,
-        status='pending'
+        requested_tier=tier,
+        current_tier=current_user.subscription_tier or 'free'
     )
     
     db.session.add(request_obj)
@@ -204,11 +236,16 @@ def request_subscription():
 @api.route('/admin/users', methods=['GET'])
 @login_required
 def get_all_users():
-    """Get all users (admin only)"""
+    """Get a page of users (admin only; ?cursor=&limit=&tier=&email=)"""
     if not current_user.is_admin:
         return jsonify({'error': 'Admin access required'}), 403
     
-    users = User.query.all()
+    from admin_routes import get_users_page
+    try:
+        users, next_cursor = get_users_page()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     users_data = []
     
     for user in users:
@@ -221,33 +258,54 @@ def get_all_users():
             'created_at': user.created_at.isoformat() if user.created_at else None
         })
     
-    return jsonify({'users': users_data})
+    return jsonify({'users': users_data, 'next_cursor': next_cursor})
+
+@api.route('/admin/users/count', methods=['GET'])
+@login_required
+def get_user_count():
+    """Count users matching the listing filters (admin only)"""
+    if not current_user.is_admin:
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    from admin_routes import user_filters_from_request, count_users
+    try:
+        tier, email_prefix = user_filters_from_request()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'count': count_users(tier, email_prefix)})
 
 @api.route('/admin/subscription-requests', methods=['GET'])
 @login_required
 def get_subscription_requests():
-    """Get all subscription requests (admin only)"""
+    """Get a page of pending subscription requests (admin only; ?cursor=&limit=)"""
     if not current_user.is_admin:
         return jsonify({'error': 'Admin access required'}), 403
     
     from models import SubscriptionRequest
+    from pagination import page_limit
     
-    requests = SubscriptionRequest.query.filter_by(status='pending').all()
+    try:
+        requests, next_cursor = SubscriptionRequest.get_pending_page(
+            request.args.get('cursor'), page_limit(request.args.get('limit', type=int))
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     requests_data = []
     
     for req in requests:
-        user = User.query.get(req.user_id)
+        user = req.user
         requests_data.append({
             'id': req.id,
             'user_id': req.user_id,
             'username': (user.full_name or user.email.split('@')[0]) if user else 'Unknown',
             'email': user.email if user else 'Unknown',
-            'tier': req.tier,
+            'tier': req.requested_tier,
             'status': req.status,
             'created_at': req.created_at.isoformat() if req.created_at else None
         })
     
-    return jsonify({'requests': requests_data})
+    return jsonify({'requests': requests_data, 'next_cursor': next_cursor})
 
 @api.route('/admin/subscription-requests/<request_id>/approve', methods=['POST'])
 @login_required
@@ -265,15 +323,7 @@ def approve_subscription_request(request_id):
     if req.status != 'pending':
         return jsonify({'error': 'Request is not pending'}), 400
     
-    # Update user subscription
-    user = User.query.get(req.user_id)
-    if user:
-        user.subscription_tier = req.tier
-    
-    # Update request status
-    req.status = 'approved'
-    
-    db.session.commit()
+    req.approve()
     
     return jsonify({'message': 'Subscription request approved successfully'})
 
@@ -293,54 +343,50 @@ def reject_subscription_request(request_id):
     if req.status != 'pending':
         return jsonify({'error': 'Request is not pending'}), 400
     
-    req.status = 'rejected'
-    db.session.commit()
+    req.reject()
     
     return jsonify({'message': 'Subscription request rejected'})
 
+@api.route('/admin/subscription-requests/batch', methods=['POST'])
+@login_required
+def batch_subscription_requests():
+    """Approve or reject a list of subscription requests in one transaction (admin only)"""
+    if not current_user.is_admin:
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    from models import SubscriptionRequest
+    from admin_routes import subscription_batch_from_request
+    
+    try:
+        request_ids, action = subscription_batch_from_request()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        resolved_ids = SubscriptionRequest.resolve_many(request_ids, action)
+    except Exception as e:
+        return jsonify({'error': f'Failed to process requests: {str(e)}'}), 500
+    
+    return jsonify({
+        'message': f"{len(resolved_ids)} subscription requests {'approved' if action == 'approve' else 'rejected'}",
+        'resolved_ids': resolved_ids
+    })
+
 # Stock screening and watchlist endpoints can be added here as needed
 
 @api.route('/stocks/by-industry', methods=['GET'])
 def get_stocks_by_industry():
     """Get stocks organized by sector and industry - user accessible"""
+    from stock_catalog import stock_catalog
+    return conditional_response(make_etag('by-industry', stock_catalog.version()), _build_stocks_by_industry)
+
+def _build_stocks_by_industry():
+    """Serve the pre-rendered sector -> industry -> stocks index"""
     try:
-        # Import the mock stocks data from admin routes
-        from admin_routes import MOCK_STOCKS
-        
-        # Group stocks by sector and industry
-        industries = defaultdict(lambda: defaultdict(lambda: {'industry_code': '', 'stocks': []}))
-        
-        for stock in MOCK_STOCKS:
-            sector = stock.get('sector', 'Unknown')
-            industry_type = stock.get('industry_type', 'Unknown')
-            industry_code = stock.get('industry_code', 'N/A')
-            
-            # Set industry code if not already set
-            if not industries[sector][industry_type]['industry_code']:
-                industries[sector][industry_type]['industry_code'] = industry_code
-            
-            # Add stock to industry
-            industries[sector][industry_type]['stocks'].append({
-                'symbol': stock['symbol'],
-                'name': stock['name'],
-                'price': stock['price'],
-                'change_percent': stock.get('change_percent', 0)
-            })
-        
-        # Convert defaultdict to regular dict for JSON serialization
-        result = {}
-        for sector, sector_industries in industries.items():
-            result[sector] = {}
-            for industry, industry_data in sector_industries.items():
-                result[sector][industry] = {
-                    'industry_code': industry_data['industry_code'],
-                    'stocks': industry_data['stocks']
-                }
-        
-        return jsonify({'industries': result})
-        
+        from stock_catalog import stock_catalog
+        return current_app.response_class(stock_catalog.index.public_json(), mimetype='application/json')
     except Exception as e:
         return jsonify({
             'error': f'Failed to load industry data: {str(e)}',
             'industries': {}
-        }), 500
\ No newline at end of file
+        }), 500
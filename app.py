@@ -28,6 +28,10 @@ app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
 db = SQLAlchemy(model_class=Base)
 db.init_app(app)
 
+# Per-endpoint latency and SQL statement metrics
+from request_profiling import init_request_profiling
+init_request_profiling(app)
+
 # Configure Flask-Login
 login_manager = LoginManager()
 login_manager.init_app(app)
@@ -54,14 +58,17 @@ if microsoft_bp:
 
 # Initialize models with database
 from models import init_models
-User, Watchlist, StockScreening, SubscriptionRequest = init_models(db)
+User, Watchlist, WatchlistItem, StockScreening, SubscriptionRequest, Stock, ImportJob = init_models(db)
 
 # Set models in the models module for other imports
 import models
 models.User = User
 models.Watchlist = Watchlist
+models.WatchlistItem = WatchlistItem
 models.StockScreening = StockScreening
 models.SubscriptionRequest = SubscriptionRequest
+models.Stock = Stock
+models.ImportJob = ImportJob
 
 # Register admin blueprint
 from admin_routes import admin_bp
@@ -82,3 +89,6 @@ from routes import *
 with app.app_context():
     db.create_all()
     logging.info("Database tables created successfully")
+    
+    from migrations import run_migrations
+    run_migrations(db)
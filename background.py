@@ -0,0 +1,41 @@
+"""
+Background Threads for TradingGrow
+Daemon loops that run once per process, started lazily so each gunicorn worker gets its own
+"""
+
+import os
+import threading
+
+
+class PerProcessThread:
+    """Base for services that keep a daemon thread running in each process
+
+    Gunicorn forks workers after the app is imported, and threads do not
+    survive a fork, so start() restarts the thread whenever it is called from
+    a process that does not own it yet. Subclasses set thread_name, implement
+    _run() and should leave it once self._stop is set.
+    """
+
+    thread_name = 'background'
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._thread_lock = threading.Lock()
+
+    def start(self):
+        """Start the thread once per process; cheap to call on every use"""
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        raise NotImplementedError
@@ -1,6 +1,20 @@
 import random
 from datetime import datetime, timedelta
 
+# Optional import for vectorized series generation
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+def _to_list(values):
+    """Convert a NumPy array (or plain sequence) to native Python values for JSON"""
+    return values.tolist() if hasattr(values, 'tolist') else list(values)
+
+
 class MarketDataService:
     """Service to generate mock financial data for the platform"""
     
@@ -53,38 +67,75 @@ class MarketDataService:
     }
 
     @staticmethod
-    def generate_time_series_data(days=365, start_price=100.0):
-        """Generate time series data for a stock or sector"""
-        data = []
-        current_price = start_price
-        start_date = datetime.now() - timedelta(days=days)
+    def generate_time_series_columns(days=365, start_price=100.0, seed=None):
+        """Generate time series data as columns (dates, price, volume) in one vectorized pass"""
+        start_date = (datetime.now() - timedelta(days=days)).date()
         
-        for i in range(days):
-            date = start_date + timedelta(days=i)
-            # Add some realistic price movement
-            change_percent = random.uniform(-0.05, 0.05)  # -5% to +5% daily change
-            current_price *= (1 + change_percent)
-            
-            data.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'price': round(current_price, 2),
-                'volume': random.randint(1000000, 50000000)
-            })
+        if NUMPY_AVAILABLE:
+            rng = np.random.default_rng(seed)
+            # -5% to +5% daily change, compounded into the price path
+            returns = rng.uniform(-0.05, 0.05, days)
+            prices = np.round(start_price * np.cumprod(1 + returns), 2)
+            volumes = rng.integers(1000000, 50000000, days, endpoint=True)
+            dates = np.arange(np.datetime64(start_date), np.datetime64(start_date) + days).astype(str)
+            return {'dates': dates, 'price': prices, 'volume': volumes}
         
-        return data
+        rng = random.Random(seed)
+        dates, prices, volumes = [], [], []
+        current_price = start_price
+        for i in range(days):
+            current_price *= (1 + rng.uniform(-0.05, 0.05))
+            dates.append((start_date + timedelta(days=i)).isoformat())
+            prices.append(round(current_price, 2))
+            volumes.append(rng.randint(1000000, 50000000))
+        return {'dates': dates, 'price': prices, 'volume': volumes}
+
+    @staticmethod
+    def time_series_to_records(columns):
+        """Convert columnar time series to the list-of-dicts JSON format"""
+        return [
+            {'date': date, 'price': price, 'volume': volume}
+            for date, price, volume in zip(_to_list(columns['dates']), _to_list(columns['price']),
+                                           _to_list(columns['volume']))
+        ]
+
+    @staticmethod
+    def time_series_to_columnar(columns):
+        """Convert columnar time series to the compact wire format (start date plus daily step)"""
+        return {
+            'start_date': str(columns['dates'][0]) if len(columns['dates']) else None,
+            'step_days': 1,
+            'price': _to_list(columns['price']),
+            'volume': _to_list(columns['volume'])
+        }
+
+    @staticmethod
+    def generate_time_series_data(days=365, start_price=100.0, seed=None):
+        """Generate time series data for a stock or sector"""
+        columns = MarketDataService.generate_time_series_columns(days, start_price, seed)
+        return MarketDataService.time_series_to_records(columns)
 
     @staticmethod
-    def get_sector_data():
-        """Get sector performance data"""
+    def get_sector_data(seed=None, columnar=False):
+        """Get sector performance data (reproducible when a seed is given)
+
+        With columnar=True each time_series is sent as parallel price/volume
+        arrays with a start date instead of one dict per day.
+        """
+        rng = random.Random(seed)
         sector_data = {}
         
-        for sector in MarketDataService.SECTORS.keys():
+        for i, sector in enumerate(MarketDataService.SECTORS.keys()):
             # Generate sector index data
+            columns = MarketDataService.generate_time_series_columns(
+                365, rng.uniform(80.0, 120.0), None if seed is None else seed + i
+            )
             sector_data[sector] = {
                 'name': sector,
-                'current_value': round(random.uniform(80, 200), 2),
-                'change_percent': round(random.uniform(-3, 3), 2),
-                'time_series': MarketDataService.generate_time_series_data(365, random.uniform(80.0, 120.0))
+                'current_value': round(rng.uniform(80, 200), 2),
+                'change_percent': round(rng.uniform(-3, 3), 2),
+                'time_series': (MarketDataService.time_series_to_columnar(columns) if columnar
+                                else MarketDataService.time_series_to_records(columns))
             }
         
         return sector_data
@@ -155,3 +206,55 @@ class MarketDataService:
                 {'symbol': 'XOM', 'buy_point': 110.00}
             ]
         }
+
+
+# Quote fields refreshed from the live feed; everything else (e.g. buy_point) comes from storage
+LIVE_QUOTE_FIELDS = ('name', 'price', 'change', 'change_percent', 'volume')
+
+
+def get_watchlists_for_user(user_id):
+    """Get a user's watchlists with live prices merged into the stored entries
+
+    Every symbol across all watchlists is resolved in one batched, cached
+    quote lookup, however many watchlists or duplicate symbols there are.
+    """
+    from models import Watchlist
+    from financial_data_service import financial_service
+
+    grouped = Watchlist.get_grouped_by_user(user_id)
+    if not any(grouped.values()):
+        grouped = Watchlist.create_defaults(user_id, MarketDataService.get_default_watchlist_data())
+
+    watchlists = [watchlist for group in grouped.values() for watchlist in group]
+    symbols = list(dict.fromkeys(symbol for watchlist in watchlists for symbol in watchlist.stock_index))
+    quotes = financial_service.get_multiple_stocks(symbols) if symbols else {}
+
+    result = []
+    for watchlist in watchlists:
+        stocks = []
+        for stock in watchlist.stocks:
+            quote = quotes.get(stock['symbol'])
+            if quote:
+                stock.update((field, quote[field]) for field in LIVE_QUOTE_FIELDS if field in quote)
+            stocks.append(stock)
+
+        result.append({
+            'id': watchlist.id,
+            'name': watchlist.name,
+            'type': watchlist.watchlist_type,
+            'stocks': stocks,
+            'created_at': watchlist.created_at.isoformat() if watchlist.created_at else None,
+            'updated_at': watchlist.updated_at.isoformat() if watchlist.updated_at else None
+        })
+
+    return result
+
+
+def sector_chart_version():
+    """Version of the dashboard sector charts; the generated series change once a day"""
+    return datetime.now().date().toordinal()
+
+
+def get_sector_data(columnar=False):
+    """Get sector chart data for the user dashboard"""
+    return MarketDataService.get_sector_data(seed=sector_chart_version(), columnar=columnar)
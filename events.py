@@ -0,0 +1,12 @@
+"""
+Application Events for TradingGrow
+In-process change signals, so caches can invalidate themselves after writes that bypass the ORM
+"""
+
+from blinker import Namespace
+
+_signals = Namespace()
+
+# Sent after subscription tiers change for a set of users; receivers get
+# from_tier (None when mixed), to_tier and count as keyword arguments
+user_tiers_changed = _signals.signal('user-tiers-changed')
@@ -7,17 +7,26 @@ import os
 import requests
 from datetime import datetime, timedelta
 import json
+import time
+import random
 import logging
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional
+
+from metrics import metrics
+from quote_cache import QuoteCache, build_quote_cache
 
 # Optional imports for heavy data libraries
 try:
     import yfinance as yf
+    import numpy as np
     import pandas as pd
     YFINANCE_AVAILABLE = True
     PANDAS_AVAILABLE = True
 except ImportError:
     yf = None
+    np = None
     pd = None
     YFINANCE_AVAILABLE = False
     PANDAS_AVAILABLE = False
@@ -34,8 +43,74 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Bounded pool and per-request deadline for concurrent upstream fetches
+UPSTREAM_FETCH_WORKERS = int(os.getenv('UPSTREAM_FETCH_WORKERS', 12))
+UPSTREAM_FETCH_DEADLINE = float(os.getenv('UPSTREAM_FETCH_DEADLINE', 8))
+
+# Maximum symbols per vectorized history download
+BATCH_DOWNLOAD_CHUNK_SIZE = int(os.getenv('BATCH_DOWNLOAD_CHUNK_SIZE', 200))
+
+UPSTREAM_LATENCY = metrics.histogram(
+    'tradinggrow_upstream_request_duration_seconds', 'Latency of data provider calls',
+    ('provider', 'method')
+)
+UPSTREAM_REQUESTS = metrics.counter(
+    'tradinggrow_upstream_requests_total', 'Data provider calls by outcome (success or error)',
+    ('provider', 'method', 'outcome')
+)
+UPSTREAM_FALLBACKS = metrics.counter(
+    'tradinggrow_upstream_fallbacks_total', 'Responses served from built-in fallback data instead of a provider',
+    ('method',)
+)
+
+def derive_quotes(history):
+    """Compute price, change, change_percent, trend and volume for every symbol at once
+
+    history is a wide OHLCV frame with (field, symbol) columns. Each symbol's
+    quote uses its last two valid closes, so symbols with different trading
+    calendars or gaps line up correctly. Symbols without any close are dropped.
+    """
+    closes = history['Close']
+    values = closes.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=0)
+    ranks = np.cumsum(valid, axis=0)
+    
+    # Row of the last and second-to-last valid close in every column
+    last_rows = np.argmax((ranks == counts) & valid, axis=0)
+    prev_rows = np.where(counts > 1, np.argmax((ranks == counts - 1) & valid, axis=0), last_rows)
+    columns = np.arange(values.shape[1])
+    
+    price = values[last_rows, columns]
+    prev = values[prev_rows, columns]
+    change = price - prev
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change_percent = np.where(prev != 0, change / prev * 100, 0.0)
+    
+    volumes = history['Volume'].reindex(index=closes.index, columns=closes.columns).to_numpy(dtype=float)
+    volume = np.nan_to_num(volumes[last_rows, columns]).astype(np.int64)
+    
+    quotes = pd.DataFrame({
+        'price': np.round(price, 2),
+        'change': np.round(change, 2),
+        'change_percent': np.round(change_percent, 2),
+        'trend': np.where(change_percent > 0, 'up', 'down'),
+        'volume': volume
+    }, index=closes.columns)
+    return quotes[counts > 0]
+
+def as_wide_history(hist, symbol: str):
+    """View a single-symbol OHLCV frame as a wide frame with (field, symbol) columns"""
+    return hist.set_axis(pd.MultiIndex.from_product([hist.columns, [symbol]]), axis=1)
+
 class FinancialDataService:
-    def __init__(self):
+    def __init__(self, cache: Optional[QuoteCache] = None):
+        self.cache = cache or build_quote_cache()
+        self._executor = ThreadPoolExecutor(max_workers=UPSTREAM_FETCH_WORKERS,
+                                            thread_name_prefix='upstream-fetch')
+        # Outcome of the most recent real call to each provider, for health checks
+        self._upstream_status: Dict[str, Dict] = {}
+        self._status_lock = threading.Lock()
         self.alpha_vantage_key = os.getenv('ALPHA_VANTAGE_API_KEY')
         self.polygon_key = os.getenv('POLYGON_API_KEY')
         self.fmp_key = os.getenv('FMP_API_KEY')
@@ -52,12 +127,43 @@ class FinancialDataService:
             elif not self.alpha_vantage_key:
                 logger.warning("Alpha Vantage API key not found. Using fallback data sources.")
     
+    def get_upstream_status(self) -> Dict[str, Dict]:
+        """Last real outcome per provider: {'status', 'checked_at', 'error'}; providers never called are absent"""
+        with self._status_lock:
+            return {provider: dict(status) for provider, status in self._upstream_status.items()}
+    
+    def _call_upstream(self, provider: str, method: str, call: Callable, *args, **kwargs):
+        """Make one provider call, recording its latency and outcome"""
+        start = time.perf_counter()
+        try:
+            result = call(*args, **kwargs)
+        except Exception:
+            UPSTREAM_LATENCY.observe(time.perf_counter() - start, provider=provider, method=method)
+            UPSTREAM_REQUESTS.inc(provider=provider, method=method, outcome='error')
+            raise
+        UPSTREAM_LATENCY.observe(time.perf_counter() - start, provider=provider, method=method)
+        UPSTREAM_REQUESTS.inc(provider=provider, method=method, outcome='success')
+        return result
+    
+    def _record_upstream(self, provider: str, error: Optional[Exception] = None):
+        with self._status_lock:
+            self._upstream_status[provider] = {
+                'status': 'healthy' if error is None else 'degraded',
+                'checked_at': datetime.utcnow().isoformat(),
+                'error': str(error) if error is not None else None
+            }
+    
     def get_sector_performance(self) -> Dict:
         """Get real-time sector performance data"""
+        return self.cache.get_or_load('sector_performance', 'all', self._fetch_sector_performance,
+                                      fallback=self._get_fallback_sector_data)
+    
+    def _fetch_sector_performance(self) -> Dict:
+        """Fetch sector performance from the upstream providers"""
         try:
             if self.alpha_vantage_key and self.sp:
                 # Use Alpha Vantage for sector data
-                data, meta_data = self.sp.get_sector()
+                data, meta_data = self._call_upstream('alpha_vantage', 'sector_performance', self.sp.get_sector)
                 
                 sectors = []
                 rank_mapping = data.get('Rank A: Real-Time Performance', {})
@@ -68,10 +174,11 @@ class FinancialDataService:
                         'display_name': sector,
                         'performance': float(performance.replace('%', '')),
                         'trend': 'up' if float(performance.replace('%', '')) > 0 else 'down',
-                        'volume': self._generate_volume(),
-                        'market_cap': self._generate_market_cap()
+                        'volume': self._generate_volume(sector),
+                        'market_cap': self._generate_market_cap(sector)
                     })
                 
+                self._record_upstream('alpha_vantage')
                 return {
                     'sectors': sectors,
                     'last_updated': datetime.now().isoformat(),
@@ -83,10 +190,17 @@ class FinancialDataService:
                 
         except Exception as e:
             logger.error(f"Error fetching sector data: {e}")
+            self._record_upstream('alpha_vantage' if self.sp else 'yahoo_finance', e)
             return self._get_fallback_sector_data()
     
     def get_stock_data(self, symbol: str, period: str = '1y') -> Dict:
         """Get real stock data for a symbol"""
+        return self.cache.get_or_load('stock_data', f"{symbol}:{period}",
+                                      lambda: self._fetch_stock_data(symbol, period),
+                                      fallback=lambda: self._get_fallback_stock_data(symbol))
+    
+    def _fetch_stock_data(self, symbol: str, period: str) -> Dict:
+        """Fetch stock data for a symbol from the upstream providers"""
         try:
             # Check if yfinance is available
             if not YFINANCE_AVAILABLE:
@@ -95,24 +209,22 @@ class FinancialDataService:
             
             # Use Yahoo Finance as primary source (more reliable for individual stocks)
             stock = yf.Ticker(symbol)
-            hist = stock.history(period=period)
-            info = stock.info
+            hist = self._call_upstream('yahoo_finance', 'history', stock.history, period=period)
+            info = self._call_upstream('yahoo_finance', 'info', lambda: stock.info)
             
-            if hist.empty:
+            quotes = derive_quotes(as_wide_history(hist, symbol)) if not hist.empty else None
+            if quotes is None or quotes.empty:
                 raise ValueError(f"No data found for symbol {symbol}")
+            quote = quotes.to_dict('index')[symbol]
             
-            current_price = hist['Close'].iloc[-1]
-            prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
-            change = current_price - prev_close
-            change_percent = (change / prev_close) * 100 if prev_close != 0 else 0
-            
+            self._record_upstream('yahoo_finance')
             return {
                 'symbol': symbol,
                 'name': info.get('longName', symbol),
-                'price': round(current_price, 2),
-                'change': round(change, 2),
-                'change_percent': round(change_percent, 2),
-                'volume': int(hist['Volume'].iloc[-1]),
+                'price': quote['price'],
+                'change': quote['change'],
+                'change_percent': quote['change_percent'],
+                'volume': quote['volume'],
                 'market_cap': info.get('marketCap', 0),
                 'sector': info.get('sector', 'Unknown'),
                 'industry': info.get('industry', 'Unknown'),
@@ -127,10 +239,17 @@ class FinancialDataService:
             
         except Exception as e:
             logger.error(f"Error fetching stock data for {symbol}: {e}")
+            self._record_upstream('yahoo_finance', e)
             return self._get_fallback_stock_data(symbol)
     
     def get_multiple_stocks(self, symbols: List[str]) -> Dict[str, Dict]:
         """Get data for multiple stocks efficiently"""
+        return self.cache.get_many('multiple_stocks', symbols, self._fetch_multiple_stocks,
+                                   fallback=lambda missing: {symbol: self._get_fallback_stock_data(symbol)
+                                                             for symbol in missing})
+    
+    def _fetch_multiple_stocks(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Fetch data for the given uncached symbols from the upstream providers"""
         results = {}
         
         try:
@@ -141,45 +260,79 @@ class FinancialDataService:
                     results[symbol] = self._get_fallback_stock_data(symbol)
                 return results
             
-            # Use Yahoo Finance for batch processing
-            tickers = yf.Tickers(' '.join(symbols))
+            # One vectorized download for all symbols; metadata comes from the reference store
+            history = self._download_history(symbols, period='5d')
+            reference = self.get_reference_data(symbols)
+            quotes = derive_quotes(history).to_dict('index') if not history.empty else {}
             
             for symbol in symbols:
-                try:
-                    ticker = tickers.tickers[symbol]
-                    hist = ticker.history(period='5d')
-                    info = ticker.info
-                    
-                    if not hist.empty:
-                        current_price = hist['Close'].iloc[-1]
-                        prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
-                        change = current_price - prev_close
-                        change_percent = (change / prev_close) * 100 if prev_close != 0 else 0
-                        
-                        results[symbol] = {
-                            'symbol': symbol,
-                            'name': info.get('longName', symbol),
-                            'price': round(current_price, 2),
-                            'change': round(change, 2),
-                            'change_percent': round(change_percent, 2),
-                            'volume': int(hist['Volume'].iloc[-1]),
-                            'market_cap': info.get('marketCap', 0),
-                            'sector': info.get('sector', 'Unknown')
-                        }
-                except Exception as e:
-                    logger.error(f"Error processing {symbol}: {e}")
-                    results[symbol] = self._get_fallback_stock_data(symbol)
+                quote = quotes.get(symbol)
+                if quote is None:
+                    continue
+                info = reference.get(symbol, {})
+                results[symbol] = {
+                    'symbol': symbol,
+                    'name': info.get('name', symbol),
+                    'price': quote['price'],
+                    'change': quote['change'],
+                    'change_percent': quote['change_percent'],
+                    'volume': quote['volume'],
+                    'market_cap': info.get('market_cap', 0),
+                    'sector': info.get('sector', 'Unknown')
+                }
             
+            self._record_upstream('yahoo_finance')
             return results
             
         except Exception as e:
             logger.error(f"Error in batch stock fetch: {e}")
+            self._record_upstream('yahoo_finance', e)
             # Fallback to individual requests
             for symbol in symbols:
                 results[symbol] = self.get_stock_data(symbol)
             
             return results
     
+    def get_reference_data(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Get slow-changing metadata (name, sector, industry, market cap) for symbols"""
+        return self.cache.get_many('reference_data', symbols, self._fetch_reference_data)
+    
+    def _fetch_reference_data(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Fetch ticker metadata concurrently; symbols that fail are left out so they are retried"""
+        if not YFINANCE_AVAILABLE:
+            return {}
+        
+        infos = self._fetch_concurrently(
+            lambda symbol: self._call_upstream('yahoo_finance', 'info', lambda: yf.Ticker(symbol).info), symbols
+        )
+        return {
+            symbol: {
+                'name': info.get('longName', symbol),
+                'sector': info.get('sector', 'Unknown'),
+                'industry': info.get('industry', 'Unknown'),
+                'market_cap': info.get('marketCap', 0)
+            }
+            for symbol, info in infos.items() if info
+        }
+    
+    def _download_history(self, symbols: List[str], period: str = '5d'):
+        """Download OHLCV for many symbols into one wide DataFrame, one request per chunk"""
+        frames = []
+        for start in range(0, len(symbols), BATCH_DOWNLOAD_CHUNK_SIZE):
+            chunk = symbols[start:start + BATCH_DOWNLOAD_CHUNK_SIZE]
+            data = self._call_upstream('yahoo_finance', 'download', yf.download, chunk, period=period,
+                                       group_by='column', auto_adjust=True, threads=True, progress=False)
+            if data.empty:
+                continue
+            if not isinstance(data.columns, pd.MultiIndex):
+                # Single-symbol downloads come back with flat columns
+                data = as_wide_history(data, chunk[0])
+            frames.append(data)
+        
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+    
     def search_stocks(self, query: str, limit: int = 10) -> List[Dict]:
         """Search for stocks by name or symbol"""
         try:
@@ -192,7 +345,7 @@ class FinancialDataService:
                     'apikey': self.alpha_vantage_key
                 }
                 
-                response = requests.get(url, params=params)
+                response = self._call_upstream('alpha_vantage', 'symbol_search', requests.get, url, params=params)
                 data = response.json()
                 
                 results = []
@@ -205,6 +358,7 @@ class FinancialDataService:
                         'currency': match['8. currency']
                     })
                 
+                self._record_upstream('alpha_vantage')
                 return results
             
             else:
@@ -213,10 +367,17 @@ class FinancialDataService:
                 
         except Exception as e:
             logger.error(f"Error searching stocks: {e}")
+            if self.alpha_vantage_key:
+                self._record_upstream('alpha_vantage', e)
             return self._fallback_search(query, limit)
     
     def get_market_overview(self) -> Dict:
         """Get general market overview"""
+        return self.cache.get_or_load('market_overview', 'all', self._fetch_market_overview,
+                                      fallback=self._get_fallback_market_overview)
+    
+    def _fetch_market_overview(self) -> Dict:
+        """Fetch the market overview from the upstream providers"""
         try:
             # Check if yfinance is available
             if not YFINANCE_AVAILABLE:
@@ -225,24 +386,19 @@ class FinancialDataService:
             
             # Major market indices
             indices = ['^GSPC', '^DJI', '^IXIC', '^RUT']  # S&P 500, Dow, Nasdaq, Russell 2000
-            market_data = {}
+            history = self._download_history(indices, period='5d')
+            quotes = derive_quotes(history).to_dict('index') if not history.empty else {}
             
-            for index in indices:
-                stock = yf.Ticker(index)
-                hist = stock.history(period='5d')
-                
-                if not hist.empty:
-                    current = hist['Close'].iloc[-1]
-                    prev = hist['Close'].iloc[-2] if len(hist) > 1 else current
-                    change = current - prev
-                    change_percent = (change / prev) * 100 if prev != 0 else 0
-                    
-                    market_data[index] = {
-                        'value': round(current, 2),
-                        'change': round(change, 2),
-                        'change_percent': round(change_percent, 2)
-                    }
+            market_data = {
+                index: {
+                    'value': quotes[index]['price'],
+                    'change': quotes[index]['change'],
+                    'change_percent': quotes[index]['change_percent']
+                }
+                for index in indices if index in quotes
+            }
             
+            self._record_upstream('yahoo_finance')
             return {
                 'indices': market_data,
                 'last_updated': datetime.now().isoformat(),
@@ -251,6 +407,7 @@ class FinancialDataService:
             
         except Exception as e:
             logger.error(f"Error fetching market overview: {e}")
+            self._record_upstream('yahoo_finance', e)
             return self._get_fallback_market_overview()
     
     def _get_sector_etf_data(self) -> Dict:
@@ -274,34 +431,58 @@ class FinancialDataService:
             'Materials': 'XLB'
         }
         
+        histories = self._fetch_concurrently(
+            lambda symbol: self._call_upstream('yahoo_finance', 'history', yf.Ticker(symbol).history, period='5d'),
+            sector_etfs.values()
+        )
+        
+        frames = [as_wide_history(hist, symbol) for symbol, hist in histories.items() if not hist.empty]
+        quotes = derive_quotes(pd.concat(frames, axis=1)).to_dict('index') if frames else {}
+        
         sectors = []
         for sector_name, etf_symbol in sector_etfs.items():
-            try:
-                stock = yf.Ticker(etf_symbol)
-                hist = stock.history(period='5d')
-                
-                if not hist.empty:
-                    current = hist['Close'].iloc[-1]
-                    prev = hist['Close'].iloc[-2] if len(hist) > 1 else current
-                    change_percent = ((current - prev) / prev) * 100 if prev != 0 else 0
-                    
-                    sectors.append({
-                        'name': sector_name.lower().replace(' ', '_'),
-                        'display_name': sector_name,
-                        'performance': round(change_percent, 2),
-                        'trend': 'up' if change_percent > 0 else 'down',
-                        'volume': int(hist['Volume'].iloc[-1]),
-                        'market_cap': self._generate_market_cap()
-                    })
-            except Exception as e:
-                logger.error(f"Error fetching ETF data for {sector_name}: {e}")
+            quote = quotes.get(etf_symbol)
+            if quote is None:
+                continue
+            
+            sectors.append({
+                'name': sector_name.lower().replace(' ', '_'),
+                'display_name': sector_name,
+                'performance': quote['change_percent'],
+                'trend': quote['trend'],
+                'volume': quote['volume'],
+                'market_cap': self._generate_market_cap(sector_name)
+            })
         
+        self._record_upstream('yahoo_finance', None if sectors else ValueError('No sector ETF data returned'))
         return {
             'sectors': sectors,
+            'partial': len(sectors) < len(sector_etfs),
             'last_updated': datetime.now().isoformat(),
             'source': 'yahoo_finance_etf'
         }
     
+    def _fetch_concurrently(self, fetch: Callable, keys: Iterable[str],
+                            deadline: Optional[float] = None) -> Dict:
+        """Run fetch(key) for every key on the shared pool, keeping whatever finishes before the deadline"""
+        deadline = deadline or UPSTREAM_FETCH_DEADLINE
+        futures = {self._executor.submit(fetch, key): key for key in keys}
+        done, pending = wait(futures, timeout=deadline)
+        
+        for future in pending:
+            future.cancel()
+            logger.warning(f"Upstream fetch for {futures[future]} missed the {deadline}s deadline")
+        
+        results = {}
+        for future in done:
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                logger.error(f"Error fetching upstream data for {key}: {e}")
+        
+        return results
+    
     def _format_historical_data(self, hist_df) -> List[Dict]:
         """Format historical data for frontend consumption"""
         data = []
@@ -325,15 +506,21 @@ class FinancialDataService:
         
         return data
     
-    def _generate_volume(self) -> int:
+    def _synthetic_random(self, *seed) -> random.Random:
+        """Random source for placeholder figures, fixed per seed and UTC day
+
+        Placeholders must not change between fetches or workers, otherwise
+        every refresh looks like new sector data to snapshots and ETags.
+        """
+        return random.Random(':'.join(str(part) for part in seed + (datetime.utcnow().date().isoformat(),)))
+    
+    def _generate_volume(self, sector: str) -> int:
         """Generate realistic volume for sectors"""
-        import random
-        return random.randint(1000000, 50000000)
+        return self._synthetic_random('volume', sector).randint(1000000, 50000000)
     
-    def _generate_market_cap(self) -> int:
+    def _generate_market_cap(self, sector: str) -> int:
         """Generate realistic market cap"""
-        import random
-        return random.randint(100000000, 5000000000)
+        return self._synthetic_random('market_cap', sector).randint(100000000, 5000000000)
     
     def _get_market_status(self) -> str:
         """Determine if market is open/closed"""
@@ -345,6 +532,7 @@ class FinancialDataService:
     
     def _fallback_search(self, query: str, limit: int) -> List[Dict]:
         """Fallback stock search with common symbols"""
+        UPSTREAM_FALLBACKS.inc(method='search')
         common_stocks = [
             {'symbol': 'AAPL', 'name': 'Apple Inc.', 'type': 'Equity', 'region': 'United States', 'currency': 'USD'},
             {'symbol': 'GOOGL', 'name': 'Alphabet Inc.', 'type': 'Equity', 'region': 'United States', 'currency': 'USD'},
@@ -367,9 +555,10 @@ class FinancialDataService:
     
     def _get_fallback_stock_data(self, symbol: str) -> Dict:
         """Fallback stock data when API fails"""
-        import random
-        base_price = random.uniform(10, 500)
-        change = random.uniform(-10, 10)
+        UPSTREAM_FALLBACKS.inc(method='stock_data')
+        rng = self._synthetic_random('stock', symbol)
+        base_price = rng.uniform(10, 500)
+        change = rng.uniform(-10, 10)
         
         return {
             'symbol': symbol,
@@ -377,11 +566,11 @@ class FinancialDataService:
             'price': round(base_price, 2),
             'change': round(change, 2),
             'change_percent': round((change / base_price) * 100, 2),
-            'volume': random.randint(100000, 10000000),
-            'market_cap': random.randint(1000000000, 100000000000),
+            'volume': rng.randint(100000, 10000000),
+            'market_cap': rng.randint(1000000000, 100000000000),
             'sector': 'Technology',
             'industry': 'Software',
-            'pe_ratio': random.uniform(10, 30),
+            'pe_ratio': rng.uniform(10, 30),
             'dividend_yield': 0,
             'fifty_two_week_high': round(base_price * 1.2, 2),
             'fifty_two_week_low': round(base_price * 0.8, 2),
@@ -392,20 +581,20 @@ class FinancialDataService:
     
     def _get_fallback_sector_data(self) -> Dict:
         """Fallback sector data when APIs fail"""
-        import random
+        UPSTREAM_FALLBACKS.inc(method='sector_performance')
         sectors = ['Technology', 'Healthcare', 'Financial Services', 'Consumer Discretionary', 
                   'Energy', 'Industrial', 'Materials', 'Utilities', 'Real Estate']
         
         sector_list = []
         for sector in sectors:
-            performance = random.uniform(-5, 5)
+            performance = self._synthetic_random('performance', sector).uniform(-5, 5)
             sector_list.append({
                 'name': sector.lower().replace(' ', '_'),
                 'display_name': sector,
                 'performance': round(performance, 2),
                 'trend': 'up' if performance > 0 else 'down',
-                'volume': random.randint(1000000, 50000000),
-                'market_cap': random.randint(100000000, 5000000000)
+                'volume': self._generate_volume(sector),
+                'market_cap': self._generate_market_cap(sector)
             })
         
         return {
@@ -416,7 +605,7 @@ class FinancialDataService:
     
     def _get_fallback_market_overview(self) -> Dict:
         """Fallback market overview"""
-        import random
+        UPSTREAM_FALLBACKS.inc(method='market_overview')
         
         return {
             'indices': {
@@ -10,8 +10,12 @@ const AdminDashboard = ({ initialData }) => {
     const [activeTab, setActiveTab] = useState('overview');
     const [stats, setStats] = useState({});
     const [users, setUsers] = useState([]);
+    const [usersCursor, setUsersCursor] = useState(null);
+    const [userCount, setUserCount] = useState(0);
+    const [userFilters, setUserFilters] = useState({ tier: '', email: '' });
     const [stocks, setStocks] = useState([]);
     const [subscriptionRequests, setSubscriptionRequests] = useState([]);
+    const [requestsCursor, setRequestsCursor] = useState(null);
     const [loading, setLoading] = useState(true);
 
     const COLORS = ['#0088FE', '#00C49F', '#FFBB28', '#FF8042'];
@@ -46,19 +50,11 @@ const AdminDashboard = ({ initialData }) => {
                 setStats(statsData.data?.stats || {});
             }
 
-            // Load users for management
-            const usersResponse = await fetch('/admin/api/users');
-            if (usersResponse.ok) {
-                const usersData = await usersResponse.json();
-                setUsers(usersData.users || []);
-            }
+            // Load the first page of users for management
+            await loadUsers(userFilters);
 
-            // Load subscription requests
-            const requestsResponse = await fetch('/admin/api/subscription-requests');
-            if (requestsResponse.ok) {
-                const requestsData = await requestsResponse.json();
-                setSubscriptionRequests(requestsData.requests || []);
-            }
+            // Load the first page of pending subscription requests
+            await loadSubscriptionRequests();
 
             // Load stock data
             const stocksResponse = await fetch('/admin/api/stocks');
@@ -72,6 +68,45 @@ const AdminDashboard = ({ initialData }) => {
         setLoading(false);
     };
 
+    // Users are paged by cursor and filtered server-side; cursor=null starts a new listing
+    const loadUsers = async (filters, cursor = null) => {
+        const params = new URLSearchParams();
+        if (filters.tier) params.set('tier', filters.tier);
+        if (filters.email) params.set('email', filters.email);
+
+        if (!cursor) {
+            const countResponse = await fetch(`/admin/api/users/count?${params}`);
+            if (countResponse.ok) {
+                setUserCount((await countResponse.json()).count || 0);
+            }
+        }
+
+        if (cursor) params.set('cursor', cursor);
+        const usersResponse = await fetch(`/admin/api/users?${params}`);
+        if (usersResponse.ok) {
+            const usersData = await usersResponse.json();
+            setUsers(prev => cursor ? [...prev, ...(usersData.users || [])] : (usersData.users || []));
+            setUsersCursor(usersData.next_cursor || null);
+        }
+    };
+
+    // Pending requests are paged newest-first by cursor; cursor=null starts over
+    const loadSubscriptionRequests = async (cursor = null) => {
+        const params = new URLSearchParams();
+        if (cursor) params.set('cursor', cursor);
+        const requestsResponse = await fetch(`/admin/api/subscription-requests?${params}`);
+        if (requestsResponse.ok) {
+            const requestsData = await requestsResponse.json();
+            setSubscriptionRequests(prev => cursor ? [...prev, ...(requestsData.requests || [])] : (requestsData.requests || []));
+            setRequestsCursor(requestsData.next_cursor || null);
+        }
+    };
+
+    const handleUserFilterChange = (filters) => {
+        setUserFilters(filters);
+        loadUsers(filters);
+    };
+
     const handleLogout = async () => {
         try {
             // Try mock logout first
@@ -457,6 +492,11 @@ const AdminDashboard = ({ initialData }) => {
             {activeTab === 'users' && (
                 <UserManagementTab 
                     users={users} 
+                    totalUsers={userCount}
+                    filters={userFilters}
+                    onFilterChange={handleUserFilterChange}
+                    hasMore={Boolean(usersCursor)}
+                    onLoadMore={() => loadUsers(userFilters, usersCursor)}
                     onRefresh={loadAdminData} 
                 />
             )}
@@ -464,7 +504,10 @@ const AdminDashboard = ({ initialData }) => {
             {activeTab === 'subscriptions' && (
                 <SubscriptionManagementTab 
                     users={users}
+                    stats={stats}
                     subscriptionRequests={subscriptionRequests}
+                    hasMoreRequests={!!requestsCursor}
+                    onLoadMoreRequests={() => loadSubscriptionRequests(requestsCursor)}
                     onRefresh={loadAdminData}
                 />
             )}
@@ -1,5 +1,8 @@
 import React, { useState } from 'react';
 
+// The server fails a job a couple of minutes after its worker dies; this backs that up on the client
+const IMPORT_STALL_TIMEOUT_MS = 5 * 60 * 1000;
+
 const StockManagementTab = ({ stocks, onRefresh }) => {
     const [selectedStock, setSelectedStock] = useState(null);
     const [showAddModal, setShowAddModal] = useState(false);
@@ -101,13 +104,40 @@ const StockManagementTab = ({ stocks, onRefresh }) => {
 
             const data = await response.json();
 
-            if (response.ok) {
+            if (!response.ok) {
+                alert(`❌ Error: ${data.error || 'Failed to upload CSV'}`);
+                return;
+            }
+
+            // The import runs as a background job; poll it until it finishes, giving up
+            // if it makes no progress for IMPORT_STALL_TIMEOUT_MS
+            let job = data.job;
+            let lastProgressAt = Date.now();
+            while (job.status === 'queued' || job.status === 'running') {
+                if (Date.now() - lastProgressAt > IMPORT_STALL_TIMEOUT_MS) {
+                    alert('❌ The import stopped reporting progress. Check the stock list before uploading again.');
+                    return;
+                }
+                await new Promise((resolve) => setTimeout(resolve, 1000));
+                const statusResponse = await fetch(data.status_url);
+                if (!statusResponse.ok) {
+                    throw new Error(`Status check failed (${statusResponse.status})`);
+                }
+                const next = (await statusResponse.json()).job;
+                if (next.status !== job.status || next.rows_read !== job.rows_read) {
+                    lastProgressAt = Date.now();
+                }
+                job = next;
+                setUploadProgress(Math.round(job.progress || 0));
+            }
+
+            if (job.status === 'completed') {
                 setShowUploadModal(false);
                 setCsvFile(null);
                 onRefresh();
-                alert(`✅ ${data.message}\nProcessed: ${data.processed || 0} stocks\nErrors: ${data.errors || 0}`);
+                alert(`✅ ${job.message}\nProcessed: ${job.processed || 0} stocks\nErrors: ${job.errors || 0}`);
             } else {
-                alert(`❌ Error: ${data.error || 'Failed to upload CSV'}`);
+                alert(`❌ Error: ${job.message || 'Failed to import CSV'}`);
             }
         } catch (error) {
             console.error('Error uploading CSV:', error);
@@ -425,7 +455,7 @@ const StockManagementTab = ({ stocks, onRefresh }) => {
                                                 className="progress-bar progress-bar-striped progress-bar-animated" 
                                                 style={{width: `${uploadProgress}%`}}
                                             >
-                                                Uploading... {uploadProgress}%
+                                                Importing... {uploadProgress}%
                                             </div>
                                         </div>
                                     </div>
@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
 
-const SubscriptionManagementTab = ({ users, subscriptionRequests, onRefresh }) => {
+const SubscriptionManagementTab = ({ users, stats, subscriptionRequests, hasMoreRequests, onLoadMoreRequests, onRefresh }) => {
     const [showUpgradeModal, setShowUpgradeModal] = useState(false);
     const [selectedUser, setSelectedUser] = useState(null);
 
@@ -27,6 +27,33 @@ const SubscriptionManagementTab = ({ users, subscriptionRequests, onRefresh }) =
         }
     };
 
+    const handleBatchRequests = async (action) => {
+        const ids = subscriptionRequests.map(request => request.id);
+        if (!confirm(`${action === 'approve' ? 'Approve' : 'Reject'} all ${ids.length} listed requests?`)) return;
+
+        try {
+            const response = await fetch('/admin/api/subscription-requests/batch', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({ ids, action })
+            });
+
+            const data = await response.json();
+
+            if (response.ok) {
+                alert(`✅ ${data.message}`);
+                onRefresh();
+            } else {
+                alert(`❌ ${data.error || 'Failed to process requests'}`);
+            }
+        } catch (error) {
+            console.error('Error processing subscription requests:', error);
+            alert('Error processing subscription requests');
+        }
+    };
+
     const handleBulkUpgrade = async (fromTier, toTier) => {
         if (!confirm(`Upgrade all ${fromTier} users to ${toTier}?`)) return;
 
@@ -74,17 +101,13 @@ const SubscriptionManagementTab = ({ users, subscriptionRequests, onRefresh }) =
         }
     };
 
-    // Calculate subscription statistics
-    const stats = {
-        free_users: users.filter(u => u.subscription_tier === 'free').length,
-        medium_users: users.filter(u => u.subscription_tier === 'medium').length,
-        pro_users: users.filter(u => u.subscription_tier === 'pro').length,
-        total_revenue: users.reduce((sum, u) => {
-            if (u.subscription_tier === 'medium') return sum + 19.99;
-            if (u.subscription_tier === 'pro') return sum + 49.99;
-            return sum;
-        }, 0)
+    // Subscription statistics from the server-side tier counts; `users` is only the loaded, filtered page
+    const tierCounts = {
+        free_users: stats.free_users || 0,
+        medium_users: stats.medium_users || 0,
+        pro_users: stats.pro_users || 0
     };
+    const totalRevenue = tierCounts.medium_users * 19.99 + tierCounts.pro_users * 49.99;
 
     return (
         <div className="p-4">
@@ -103,7 +126,7 @@ const SubscriptionManagementTab = ({ users, subscriptionRequests, onRefresh }) =
                 <div className="col-md-3">
                     <div className="card text-center">
                         <div className="card-body">
-                            <h5 className="text-muted">{stats.free_users}</h5>
+                            <h5 className="text-muted">{tierCounts.free_users}</h5>
                             <p className="mb-0">Free Users</p>
                         </div>
                     </div>
@@ -111,7 +134,7 @@ const SubscriptionManagementTab = ({ users, subscriptionRequests, onRefresh }) =
                 <div className="col-md-3">
                     <div className="card text-center">
                         <div className="card-body">
-                            <h5 className="text-info">{stats.medium_users}</h5>
+                            <h5 className="text-info">{tierCounts.medium_users}</h5>
                             <p className="mb-0">Medium Users</p>
                         </div>
                     </div>
@@ -119,7 +142,7 @@ const SubscriptionManagementTab = ({ users, subscriptionRequests, onRefresh }) =
                 <div className="col-md-3">
                     <div className="card text-center">
                         <div className="card-body">
-                            <h5 className="text-success">{stats.pro_users}</h5>
+                            <h5 className="text-success">{tierCounts.pro_users}</h5>
                             <p className="mb-0">Pro Users</p>
                         </div>
                     </div>
@@ -127,7 +150,7 @@ const SubscriptionManagementTab = ({ users, subscriptionRequests, onRefresh }) =
                 <div className="col-md-3">
                     <div className="card text-center">
                         <div className="card-body">
-                            <h5 className="text-primary">${stats.total_revenue.toFixed(2)}</h5>
+                            <h5 className="text-primary">${totalRevenue.toFixed(2)}</h5>
                             <p className="mb-0">Monthly Revenue</p>
                         </div>
                     </div>
@@ -137,11 +160,25 @@ const SubscriptionManagementTab = ({ users, subscriptionRequests, onRefresh }) =
             {/* Subscription Requests */}
             {subscriptionRequests.length > 0 && (
                 <div className="card mb-4">
-                    <div className="card-header">
+                    <div className="card-header d-flex justify-content-between align-items-center">
                         <h5 className="mb-0">
                             <i className="fas fa-clock me-2"></i>
-                            Pending Subscription Requests ({subscriptionRequests.length})
+                            Pending Subscription Requests ({subscriptionRequests.length}{hasMoreRequests ? '+' : ''})
                         </h5>
+                        <div className="btn-group btn-group-sm">
+                            <button 
+                                className="btn btn-outline-success"
+                                onClick={() => handleBatchRequests('approve')}
+                            >
+                                <i className="fas fa-check-double"></i> Approve All
+                            </button>
+                            <button 
+                                className="btn btn-outline-danger"
+                                onClick={() => handleBatchRequests('reject')}
+                            >
+                                <i className="fas fa-times"></i> Reject All
+                            </button>
+                        </div>
                     </div>
                     <div className="card-body p-0">
                         <div className="table-responsive">
@@ -197,6 +234,13 @@ const SubscriptionManagementTab = ({ users, subscriptionRequests, onRefresh }) =
                                 </tbody>
                             </table>
                         </div>
+                        {hasMoreRequests && (
+                            <div className="text-center my-3">
+                                <button className="btn btn-outline-secondary" onClick={onLoadMoreRequests}>
+                                    Load more
+                                </button>
+                            </div>
+                        )}
                     </div>
                 </div>
             )}
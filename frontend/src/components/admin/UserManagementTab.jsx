@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
 
-const UserManagementTab = ({ users, onRefresh }) => {
+const UserManagementTab = ({ users, totalUsers, filters = { tier: '', email: '' }, onFilterChange, hasMore, onLoadMore, onRefresh }) => {
     const [selectedUser, setSelectedUser] = useState(null);
     const [editingUser, setEditingUser] = useState(null);
     const [showAddModal, setShowAddModal] = useState(false);
@@ -86,6 +86,36 @@ const UserManagementTab = ({ users, onRefresh }) => {
                 </button>
             </div>
 
+            {/* Server-side filters */}
+            {onFilterChange && (
+                <div className="row g-2 mb-3 align-items-center">
+                    <div className="col-md-4">
+                        <input
+                            type="search"
+                            className="form-control"
+                            placeholder="Email starts with..."
+                            value={filters.email}
+                            onChange={(e) => onFilterChange({ ...filters, email: e.target.value })}
+                        />
+                    </div>
+                    <div className="col-md-3">
+                        <select
+                            className="form-select"
+                            value={filters.tier}
+                            onChange={(e) => onFilterChange({ ...filters, tier: e.target.value })}
+                        >
+                            <option value="">All tiers</option>
+                            <option value="free">Free</option>
+                            <option value="medium">Medium</option>
+                            <option value="pro">Pro</option>
+                        </select>
+                    </div>
+                    <div className="col-md-5 text-muted text-end">
+                        Showing {users.length} of {totalUsers ?? users.length} users
+                    </div>
+                </div>
+            )}
+
             {/* Users Table */}
             <div className="table-responsive">
                 <table className="table table-hover">
@@ -149,6 +179,14 @@ const UserManagementTab = ({ users, onRefresh }) => {
                 </table>
             </div>
 
+            {hasMore && (
+                <div className="text-center mb-4">
+                    <button className="btn btn-outline-secondary" onClick={onLoadMore}>
+                        Load more
+                    </button>
+                </div>
+            )}
+
             {users.length === 0 && (
                 <div className="text-center py-5">
                     <i className="fas fa-users fa-3x text-muted mb-3"></i>
@@ -51,14 +51,51 @@ const UserDashboard = () => {
         loadIndustryData();
         setLoading(false);
         
-        // Auto-refresh subscription status every 30 seconds, but only if user exists
-        const interval = setInterval(() => {
-            if (user) {
+        // Live sector and quote changes are pushed by the server; fall back to polling without EventSource
+        if (!window.EventSource) {
+            const interval = setInterval(() => {
                 refreshUserData();
                 loadIndustryData(); // Also refresh industry data
-            }
-        }, 30000);
-        return () => clearInterval(interval);
+            }, 30000);
+            return () => clearInterval(interval);
+        }
+
+        const stream = new EventSource('/api/stream/dashboard');
+        stream.addEventListener('sectors', (event) => {
+            setSectorData(JSON.parse(event.data).sectorData || {});
+        });
+        // Later sector updates carry only the sectors that changed, plus the full name order
+        stream.addEventListener('sector-changes', (event) => {
+            const { changed, order, meta } = JSON.parse(event.data);
+            setSectorData((current) => {
+                const byName = Object.fromEntries((current.sectors || []).map((sector) => [sector.name, sector]));
+                return {
+                    ...current,
+                    ...meta,
+                    sectors: order.map((name) => changed[name] || byName[name]).filter(Boolean)
+                };
+            });
+        });
+        stream.addEventListener('quotes', (event) => {
+            const quotes = JSON.parse(event.data).quotes || {};
+            setWatchlists((current) => current.map((watchlist) => ({
+                ...watchlist,
+                stocks: (watchlist.stocks || []).map((stock) => (
+                    quotes[stock.symbol] ? { ...stock, ...quotes[stock.symbol] } : stock
+                ))
+            })));
+        });
+        // Sent when this client fell behind and missed updates
+        stream.addEventListener('resync', () => refreshUserData());
+        // Subscription tier and stock catalog changes are not streamed; re-check them on a slower timer
+        const interval = setInterval(() => {
+            refreshUserData();
+            loadIndustryData();
+        }, 120000);
+        return () => {
+            clearInterval(interval);
+            stream.close();
+        };
     }, []);
 
     const refreshUserData = async () => {
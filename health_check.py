@@ -3,10 +3,20 @@ Health Check and Monitoring for TradingGrow
 Provides health endpoints and system monitoring
 """
 
-from flask import Blueprint, jsonify
-from financial_data_service import financial_service
+from flask import Blueprint, Response, jsonify
+from background import PerProcessThread
+from financial_data_service import financial_service, UPSTREAM_FALLBACKS, UPSTREAM_LATENCY, UPSTREAM_REQUESTS
+from metrics import metrics
+from quote_cache import QUOTE_CACHE_LOOKUPS
+from request_profiling import slowest_endpoints
 import os
+import logging
+import threading
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import text
 
 # Optional import for psutil
 try:
@@ -16,49 +26,147 @@ except ImportError:
     psutil = None
     PSUTIL_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
+# How often the background sampler pings the database and reads system load
+HEALTH_SAMPLE_SECONDS = float(os.getenv('HEALTH_SAMPLE_SECONDS', 10))
+# Samples older than this many intervals mean the sampler has stopped
+HEALTH_STALE_INTERVALS = 3
+
 health_bp = Blueprint('health', __name__)
 
+
+@dataclass(frozen=True)
+class HealthSnapshot:
+    """One background sample of database reachability and system load"""
+    database: str
+    database_version: str
+    memory_usage: float
+    disk_usage: float
+    cpu_usage: float
+    load_average: Optional[Tuple[float, float, float]]
+    sampled_at: datetime
+
+
+class HealthSampler(PerProcessThread):
+    """Samples health off the request path so probes only read the latest snapshot
+
+    CPU is read with psutil's non-blocking cpu_percent(interval=None), which
+    reports usage since the previous sample.
+    """
+
+    thread_name = 'health-sampler'
+
+    def __init__(self, interval: float = HEALTH_SAMPLE_SECONDS):
+        super().__init__()
+        self.interval = interval
+        self._app = None
+        self._snapshot: Optional[HealthSnapshot] = None
+        self._sample_lock = threading.Lock()
+
+    def init_app(self, app):
+        self._app = app
+
+    def snapshot(self) -> HealthSnapshot:
+        """Return the latest sample, sampling synchronously only on first use"""
+        self.start()
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._sample_lock:
+                if self._snapshot is None:
+                    self.sample()
+            snapshot = self._snapshot
+        return snapshot
+
+    def is_stale(self, snapshot: HealthSnapshot) -> bool:
+        age = (datetime.utcnow() - snapshot.sampled_at).total_seconds()
+        return age > self.interval * HEALTH_STALE_INTERVALS
+
+    def sample(self):
+        """Ping the database and read system load, then publish a new snapshot"""
+        database, database_version = self._check_database()
+
+        if PSUTIL_AVAILABLE:
+            memory_usage = psutil.virtual_memory().percent
+            disk_usage = psutil.disk_usage('/').percent
+            cpu_usage = psutil.cpu_percent(interval=None)
+        else:
+            memory_usage = 0
+            disk_usage = 0
+            cpu_usage = 0
+
+        self._snapshot = HealthSnapshot(
+            database=database,
+            database_version=database_version,
+            memory_usage=memory_usage,
+            disk_usage=disk_usage,
+            cpu_usage=cpu_usage,
+            load_average=os.getloadavg() if hasattr(os, 'getloadavg') else None,
+            sampled_at=datetime.utcnow()
+        )
+
+    def _check_database(self) -> Tuple[str, str]:
+        from app import db
+
+        try:
+            with self._app.app_context():
+                with db.engine.connect() as conn:
+                    conn.execute(text('SELECT 1'))
+                    version = conn.dialect.server_version_info
+                    name = conn.dialect.name
+            version = '.'.join(str(part) for part in version) if version else 'unknown'
+            return "healthy", f"{name} {version}"
+        except Exception as e:
+            return f"unhealthy: {str(e)}", "unknown"
+
+    def _run(self):
+        while not self._stop.wait(self.interval if self._snapshot is not None else 0):
+            try:
+                with self._sample_lock:
+                    self.sample()
+            except Exception as e:
+                logger.error(f"Error sampling health: {e}")
+
+
+def upstream_api_status() -> str:
+    """Summarise the outcome of the most recent real call to each provider"""
+    failures = [
+        f"{provider}: {status['error']}"
+        for provider, status in sorted(financial_service.get_upstream_status().items())
+        if status['status'] != 'healthy'
+    ]
+    return f"degraded: {'; '.join(failures)}" if failures else "healthy"
+
+
+@health_bp.record_once
+def _init_sampler(state):
+    health_sampler.init_app(state.app)
+
+
+def current_database_status(snapshot: HealthSnapshot) -> str:
+    if health_sampler.is_stale(snapshot):
+        return f"unhealthy: no health sample since {snapshot.sampled_at.isoformat()}"
+    return snapshot.database
+
+
 @health_bp.route('/health', methods=['GET'])
 def health_check():
-    """Basic health check endpoint"""
-    try:
-        # Check database connection
-        from app import db
-        db.engine.execute('SELECT 1')
-        db_status = "healthy"
-    except Exception as e:
-        db_status = f"unhealthy: {str(e)}"
-    
-    # Check system resources
-    if PSUTIL_AVAILABLE:
-        memory_usage = psutil.virtual_memory().percent
-        disk_usage = psutil.disk_usage('/').percent
-        cpu_usage = psutil.cpu_percent(interval=1)
-    else:
-        memory_usage = 0
-        disk_usage = 0
-        cpu_usage = 0
-    
-    # Check external API connectivity
-    api_status = "healthy"
-    try:
-        # Test Alpha Vantage API if key is available
-        if os.getenv('ALPHA_VANTAGE_API_KEY'):
-            financial_service.get_sector_performance()
-    except Exception as e:
-        api_status = f"degraded: {str(e)}"
+    """Basic health check endpoint, served from the latest background sample"""
+    snapshot = health_sampler.snapshot()
+    db_status = current_database_status(snapshot)
     
     health_status = {
         "status": "healthy" if db_status == "healthy" else "unhealthy",
         "timestamp": datetime.utcnow().isoformat(),
+        "sampled_at": snapshot.sampled_at.isoformat(),
         "services": {
             "database": db_status,
-            "external_apis": api_status
+            "external_apis": upstream_api_status()
         },
         "system": {
-            "memory_usage": f"{memory_usage}%",
-            "disk_usage": f"{disk_usage}%",
-            "cpu_usage": f"{cpu_usage}%"
+            "memory_usage": f"{snapshot.memory_usage}%",
+            "disk_usage": f"{snapshot.disk_usage}%",
+            "cpu_usage": f"{snapshot.cpu_usage}%"
         },
         "version": "1.0.0"
     }
@@ -72,63 +180,74 @@ def detailed_health_check():
     
     checks = {}
     overall_status = "healthy"
+    snapshot = health_sampler.snapshot()
     
     # Database check
-    try:
-        from app import db
-        result = db.engine.execute('SELECT version()')
-        db_version = result.fetchone()[0]
+    db_status = current_database_status(snapshot)
+    if db_status == "healthy":
         checks['database'] = {
             "status": "healthy",
-            "details": f"PostgreSQL: {db_version}",
-            "response_time": "< 100ms"
+            "details": snapshot.database_version,
+            "sampled_at": snapshot.sampled_at.isoformat()
         }
-    except Exception as e:
+    else:
         checks['database'] = {
             "status": "unhealthy",
-            "details": str(e),
-            "response_time": "timeout"
+            "details": db_status,
+            "sampled_at": snapshot.sampled_at.isoformat()
         }
         overall_status = "unhealthy"
     
-    # External API checks
+    # External API checks, from the latency and outcomes of real provider calls
+    # (one collect per request: it re-reads every worker's metrics file)
+    collected = metrics.collect()
     api_checks = {}
+    upstream_status = financial_service.get_upstream_status()
+    latency = collected[UPSTREAM_LATENCY.name].summary()
+    outcomes = collected[UPSTREAM_REQUESTS.name].series()
     
-    # Alpha Vantage
-    if os.getenv('ALPHA_VANTAGE_API_KEY'):
-        try:
-            start_time = datetime.now()
-            financial_service.get_sector_performance()
-            response_time = (datetime.now() - start_time).total_seconds() * 1000
-            api_checks['alpha_vantage'] = {
-                "status": "healthy",
-                "response_time": f"{response_time:.0f}ms"
+    for provider in ('alpha_vantage', 'yahoo_finance'):
+        if provider == 'alpha_vantage' and not os.getenv('ALPHA_VANTAGE_API_KEY'):
+            api_checks[provider] = {
+                "status": "not_configured",
+                "details": "API key not provided"
             }
-        except Exception as e:
-            api_checks['alpha_vantage'] = {
-                "status": "degraded",
-                "error": str(e)
+            continue
+        
+        methods = {}
+        for (call_provider, method), summary in sorted(latency.items()):
+            if call_provider != provider:
+                continue
+            errors = outcomes.get((provider, method, 'error'), 0)
+            methods[method] = {
+                "requests": summary['count'],
+                "errors": errors,
+                "error_rate": round(errors / summary['count'], 4),
+                "p50_response_time": f"{summary['p50'] * 1000:.0f}ms",
+                "p95_response_time": f"{summary['p95'] * 1000:.0f}ms"
             }
-    else:
-        api_checks['alpha_vantage'] = {
-            "status": "not_configured",
-            "details": "API key not provided"
+        
+        last = upstream_status.get(provider)
+        api_checks[provider] = {
+            "status": last['status'] if last else "no_traffic",
+            "last_checked": last['checked_at'] if last else None,
+            "last_error": last['error'] if last else None,
+            "methods": methods
         }
     
-    # Yahoo Finance
-    try:
-        start_time = datetime.now()
-        financial_service.get_stock_data('AAPL')
-        response_time = (datetime.now() - start_time).total_seconds() * 1000
-        api_checks['yahoo_finance'] = {
-            "status": "healthy",
-            "response_time": f"{response_time:.0f}ms"
-        }
-    except Exception as e:
-        api_checks['yahoo_finance'] = {
-            "status": "degraded",
-            "error": str(e)
+    lookups = collected[QUOTE_CACHE_LOOKUPS.name].series()
+    cache_methods = sorted({method for method, _ in lookups})
+    checks['quote_cache'] = {
+        method: {
+            "hits": lookups.get((method, 'hit'), 0),
+            "misses": lookups.get((method, 'miss'), 0),
+            "hit_ratio": round(lookups.get((method, 'hit'), 0) /
+                               (lookups.get((method, 'hit'), 0) + lookups.get((method, 'miss'), 0)), 4)
         }
+        for method in cache_methods
+    }
+    checks['fallbacks'] = {method: count for (method,), count in sorted(collected[UPSTREAM_FALLBACKS.name].series().items())}
+    checks['slowest_endpoints'] = slowest_endpoints(collected)
     
     checks['external_apis'] = api_checks
     
@@ -149,8 +268,8 @@ def detailed_health_check():
                 "free": f"{disk.free // (1024**3)}GB",
                 "percent": f"{disk.percent}%"
             },
-            "cpu_percent": f"{psutil.cpu_percent(interval=1)}%",
-            "load_average": list(os.getloadavg()) if hasattr(os, 'getloadavg') else "N/A"
+            "cpu_percent": f"{snapshot.cpu_usage}%",
+            "load_average": list(snapshot.load_average) if snapshot.load_average else "N/A"
         }
     else:
         checks['system'] = {
@@ -172,25 +291,26 @@ def detailed_health_check():
         "version": "1.0.0"
     }), 200 if overall_status == "healthy" else 503
 
+@health_bp.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus scrape endpoint, summed over workers when PROMETHEUS_MULTIPROC_DIR is set"""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @health_bp.route('/health/ready', methods=['GET'])
 def readiness_check():
     """Kubernetes readiness probe"""
-    try:
-        # Quick database check
-        from app import db
-        db.engine.execute('SELECT 1')
-        
+    db_status = current_database_status(health_sampler.snapshot())
+    if db_status == "healthy":
         return jsonify({
             "status": "ready",
             "timestamp": datetime.utcnow().isoformat()
         }), 200
-        
-    except Exception as e:
-        return jsonify({
-            "status": "not_ready",
-            "error": str(e),
-            "timestamp": datetime.utcnow().isoformat()
-        }), 503
+    
+    return jsonify({
+        "status": "not_ready",
+        "error": db_status,
+        "timestamp": datetime.utcnow().isoformat()
+    }), 503
 
 @health_bp.route('/health/live', methods=['GET'])
 def liveness_check():
@@ -198,4 +318,8 @@ def liveness_check():
     return jsonify({
         "status": "alive",
         "timestamp": datetime.utcnow().isoformat()
-    }), 200
\ No newline at end of file
+    }), 200
+
+
+# Global instance
+health_sampler = HealthSampler()
@@ -0,0 +1,34 @@
+"""
+HTTP Conditional Requests for TradingGrow
+Version-based ETags so unchanged polls get a 304 before the payload is built
+"""
+
+import json
+import hashlib
+from typing import Any, Callable
+
+from flask import request, make_response
+
+
+def make_etag(*versions: Any) -> str:
+    """Build an ETag from whatever identifies the data behind a response"""
+    return hashlib.sha1(json.dumps(versions, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def conditional_response(etag: str, build: Callable[[], Any]):
+    """Answer If-None-Match with 304, otherwise build the response and tag it
+
+    build is only called on a miss, so an unchanged poll costs neither the
+    payload construction nor its serialization.
+    """
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(build())
+        if response.status_code != 200:
+            return response
+
+    response.set_etag(etag)
+    # Responses are per-user; clients may keep them but must revalidate
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
@@ -0,0 +1,147 @@
+"""
+Background Import Jobs for TradingGrow
+Runs uploaded CSV imports on a local worker pool and records their progress in the database
+"""
+
+import os
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from background import PerProcessThread
+from stock_catalog import stock_catalog
+from stock_import import STOCK_IMPORT_BATCH_SIZE, import_stocks_csv
+
+logger = logging.getLogger(__name__)
+
+# Imports run concurrently per gunicorn worker, and where uploads wait until they run
+STOCK_IMPORT_WORKERS = int(os.getenv('STOCK_IMPORT_WORKERS', 2))
+IMPORT_UPLOAD_DIR = os.getenv('IMPORT_UPLOAD_DIR', tempfile.gettempdir())
+# How often a worker vouches for the jobs it holds, and how long after the last heartbeat a
+# queued or running job counts as lost (its worker restarted or crashed mid-import)
+IMPORT_JOB_HEARTBEAT_SECONDS = float(os.getenv('IMPORT_JOB_HEARTBEAT_SECONDS', 15))
+IMPORT_JOB_STALE_SECONDS = float(os.getenv('IMPORT_JOB_STALE_SECONDS', 120))
+
+
+class ImportJobRunner(PerProcessThread):
+    """Queues uploads as ImportJob rows and processes them off the request thread
+
+    Job state lives in the database, so any worker can answer a progress
+    poll. The file itself is only read by the process that accepted it; that
+    process heartbeats its queued and running jobs, so a poll can tell when
+    the process died and the job will never finish.
+    """
+
+    thread_name = 'import-job-heartbeat'
+
+    def __init__(self, workers: int = STOCK_IMPORT_WORKERS, batch_size: int = STOCK_IMPORT_BATCH_SIZE,
+                 heartbeat_interval: float = IMPORT_JOB_HEARTBEAT_SECONDS):
+        super().__init__()
+        self.workers = workers
+        self.batch_size = batch_size
+        self.heartbeat_interval = heartbeat_interval
+        self._app = None
+        self._held = set()
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Executor threads do not survive a fork, so each gunicorn worker creates its own
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='stock-import')
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def submit_stock_csv(self, app, upload):
+        """Spool an uploaded CSV to disk and queue it for import; returns the ImportJob"""
+        from models import ImportJob
+
+        fd, path = tempfile.mkstemp(prefix='stock-import-', suffix='.csv', dir=IMPORT_UPLOAD_DIR)
+        os.close(fd)
+        try:
+            upload.save(path)
+            job = ImportJob(filename=upload.filename, bytes_total=os.path.getsize(path)).save()
+        except Exception:
+            os.remove(path)
+            raise
+
+        with self._lock:
+            self._app = app
+            self._held.add(job.id)
+        self.start()
+        self._pool().submit(self._process, app, job.id, path)
+        return job
+
+    def heartbeat(self):
+        """Refresh heartbeat_at on every job this process still holds"""
+        from app import db
+        from models import ImportJob
+
+        with self._lock:
+            app, held = self._app, list(self._held)
+        if not held:
+            return
+        with app.app_context():
+            try:
+                ImportJob.heartbeat(held)
+            finally:
+                db.session.remove()
+
+    def _run(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                self.heartbeat()
+            except Exception as e:
+                logger.error(f"Error recording import job heartbeats: {e}")
+
+    def _process(self, app, job_id: str, path: str):
+        from app import db
+        from models import ImportJob
+
+        with app.app_context():
+            try:
+                job = ImportJob.get(job_id)
+                job.status = 'running'
+                job.started_at = job.heartbeat_at = datetime.utcnow()
+                db.session.commit()
+
+                with open(path, 'rb') as stream:
+                    def on_progress(result):
+                        job.record_progress(result, stream.tell())
+                        db.session.commit()
+
+                    result = import_stocks_csv(db, stream, batch_size=self.batch_size, on_progress=on_progress)
+
+                job.record_progress(result, job.bytes_total)
+                job.status = 'completed'
+                job.message = f'CSV processed successfully! {result.processed} stocks processed.'
+                job.finished_at = datetime.utcnow()
+                db.session.commit()
+                logger.info(f"Import job {job_id} completed: {result.processed} stocks, {result.error_count} errors")
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Import job {job_id} failed: {e}")
+                job = ImportJob.get(job_id)
+                if job is not None:
+                    job.status = 'failed'
+                    job.message = f'Failed to process CSV file: {str(e)}'
+                    job.finished_at = datetime.utcnow()
+                    db.session.commit()
+            finally:
+                with self._lock:
+                    self._held.discard(job_id)
+                # Batches committed before a failure are kept, so refresh either way
+                stock_catalog.invalidate()
+                db.session.remove()
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+# Global instance
+import_job_runner = ImportJobRunner()
@@ -0,0 +1,102 @@
+"""
+Industry Index for TradingGrow
+Sector -> industry -> stocks tree maintained incrementally as the stock catalog changes
+"""
+
+import json
+import threading
+from typing import Dict, Iterable, Optional
+
+
+class IndustryIndex:
+    """Grouped view of the stock catalog with pre-serialized responses
+
+    Writes move a single stock between groups. The JSON bodies served by the
+    read endpoints are rendered once after a change and reused until the
+    next one.
+    """
+
+    def __init__(self, stocks: Iterable[Dict] = ()):
+        self._lock = threading.Lock()
+        self.rebuild(stocks)
+
+    def rebuild(self, stocks: Iterable[Dict]):
+        """Replace the whole index, e.g. after the catalog was reloaded"""
+        with self._lock:
+            self._groups: Dict[tuple, Dict[str, Dict]] = {}
+            self._locations: Dict[str, tuple] = {}
+            for stock in stocks:
+                self._insert(stock)
+            self._rendered = {}
+
+    def upsert(self, stock: Dict):
+        """Add a stock or re-file it after its sector, industry or price changed"""
+        with self._lock:
+            self._discard(stock['id'])
+            self._insert(stock)
+            self._rendered = {}
+
+    def remove(self, stock_id: str):
+        with self._lock:
+            self._discard(stock_id)
+            self._rendered = {}
+
+    def __len__(self):
+        return len(self._locations)
+
+    def public_json(self) -> str:
+        """Body for /api/stocks/by-industry"""
+        return self._render('public', self._public_view)
+
+    def admin_json(self) -> str:
+        """Body for /admin/api/stocks/by-industry"""
+        return self._render('admin', self._admin_view)
+
+    def _insert(self, stock: Dict):
+        # Keys keep "missing" (None) apart from "empty", as the endpoints' defaults differ
+        key = (stock.get('sector'), stock.get('industry_type'))
+        self._groups.setdefault(key, {})[stock['id']] = stock
+        self._locations[stock['id']] = key
+
+    def _discard(self, stock_id: str):
+        key = self._locations.pop(stock_id, None)
+        if key is None:
+            return
+        group = self._groups[key]
+        group.pop(stock_id, None)
+        if not group:
+            del self._groups[key]
+
+    def _render(self, view: str, build) -> str:
+        with self._lock:
+            body = self._rendered.get(view)
+            if body is None:
+                body = json.dumps(build(), sort_keys=True, separators=(',', ':'))
+                self._rendered[view] = body
+            return body
+
+    def _grouped(self, default: str, stock_fields: Optional[tuple] = None) -> Dict:
+        industries = {}
+        for (sector, industry_type), group in self._groups.items():
+            stocks = list(group.values())
+            entry = industries.setdefault(sector if sector is not None else default, {}).setdefault(
+                industry_type if industry_type is not None else default,
+                {'industry_code': stocks[0].get('industry_code', 'N/A'), 'stocks': []}
+            )
+            if stock_fields is None:
+                entry['stocks'].extend(stocks)
+            else:
+                entry['stocks'].extend(
+                    {field: stock.get(field, 0) for field in stock_fields} for stock in stocks
+                )
+        return industries
+
+    def _public_view(self) -> Dict:
+        return {'industries': self._grouped('Unknown', ('symbol', 'name', 'price', 'change_percent'))}
+
+    def _admin_view(self) -> Dict:
+        return {
+            'success': True,
+            'industries': self._grouped('Other'),
+            'total_stocks': len(self._locations)
+        }
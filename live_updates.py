@@ -0,0 +1,198 @@
+"""
+Live Dashboard Updates for TradingGrow
+Shared fan-out hub that pushes sector and quote deltas to Server-Sent Events clients
+"""
+
+import os
+import json
+import queue
+import logging
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+from background import PerProcessThread
+from data_service import LIVE_QUOTE_FIELDS
+from financial_data_service import FinancialDataService, financial_service
+from sector_refresher import SectorPerformanceRefresher, sector_refresher
+
+logger = logging.getLogger(__name__)
+
+# How often the publisher checks for changes, and how long idle streams wait between heartbeats
+LIVE_UPDATE_INTERVAL = float(os.getenv('LIVE_UPDATE_INTERVAL', 5))
+LIVE_HEARTBEAT_SECONDS = float(os.getenv('LIVE_HEARTBEAT_SECONDS', 15))
+# Streams are closed after this long so clients reconnect with fresh auth and watchlists
+LIVE_STREAM_MAX_SECONDS = float(os.getenv('LIVE_STREAM_MAX_SECONDS', 300))
+# Events buffered per client before a slow client is told to resync
+LIVE_QUEUE_SIZE = int(os.getenv('LIVE_QUEUE_SIZE', 64))
+
+
+def format_event(name: str, payload: Dict) -> str:
+    """Serialize one Server-Sent Event"""
+    return f"event: {name}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+def _quote_fields(quote: Dict) -> Dict:
+    return {field: quote[field] for field in LIVE_QUOTE_FIELDS if field in quote}
+
+
+def _sectors_by_name(data: Dict) -> Dict[str, Dict]:
+    return {sector['name']: sector for sector in data.get('sectors', [])}
+
+
+def sector_changes(previous: Dict[str, Dict], data: Dict) -> Dict:
+    """Payload for a 'sector-changes' event: the sectors that differ from previous
+
+    order lists every current sector name, so clients can drop removed
+    sectors and keep the snapshot's ordering; meta carries the other
+    top-level fields (last_updated, source).
+    """
+    current = _sectors_by_name(data)
+    return {
+        'changed': {name: sector for name, sector in current.items() if previous.get(name) != sector},
+        'order': list(current),
+        'meta': {key: value for key, value in data.items() if key != 'sectors'}
+    }
+
+
+class Subscription:
+    """One connected client: the symbols it watches and its pending events"""
+
+    def __init__(self, symbols: Iterable[str], maxsize: int = LIVE_QUEUE_SIZE):
+        self.symbols = frozenset(symbols)
+        self.sector_version = 0
+        # Sectors as last sent to this client, by name; the base for its next delta
+        self.sectors: Dict[str, Dict] = {}
+        self._events = queue.Queue(maxsize=maxsize)
+
+    def put(self, name: str, payload: Dict):
+        """Queue an event; a client that falls behind gets a single resync instead"""
+        try:
+            self._events.put_nowait((name, payload))
+        except queue.Full:
+            while True:
+                try:
+                    self._events.get_nowait()
+                except queue.Empty:
+                    break
+            self._events.put_nowait(('resync', {}))
+
+    def next_event(self, timeout: float) -> Optional[Tuple[str, Dict]]:
+        try:
+            return self._events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class LiveUpdateHub(PerProcessThread):
+    """Publishes sector and quote changes to every subscriber from one background loop
+
+    Each tick reads the shared sector snapshot and makes one batched, cached
+    quote lookup for the union of subscribed symbols, so the upstream cost
+    does not grow with the number of connected clients.
+    """
+
+    thread_name = 'live-update-hub'
+
+    def __init__(self, service: FinancialDataService, refresher: SectorPerformanceRefresher,
+                 interval: float = LIVE_UPDATE_INTERVAL):
+        super().__init__()
+        self.service = service
+        self.refresher = refresher
+        self.interval = interval
+        self._subscribers = set()
+        self._quotes: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+    def stop(self):
+        super().stop()
+        self._wake.set()
+
+    def subscribe(self, symbols: Iterable[str]) -> Subscription:
+        """Register a client and queue its initial state"""
+        self.start()
+        subscription = Subscription(symbols)
+        snapshot = self.refresher.snapshot()
+
+        with self._lock:
+            self._send_sectors(subscription, snapshot)
+            known = {symbol: self._quotes[symbol] for symbol in subscription.symbols if symbol in self._quotes}
+            if known:
+                subscription.put('quotes', {'quotes': known})
+            self._subscribers.add(subscription)
+            needs_quotes = len(known) < len(subscription.symbols)
+
+        if needs_quotes:
+            # Symbols nobody else watches are picked up on the next tick, not the next interval
+            self._wake.set()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish_once(self):
+        """Push whatever changed since the last tick to the subscribers that care"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return
+
+        snapshot = self.refresher.snapshot()
+        symbols = set().union(*(subscription.symbols for subscription in subscribers))
+        quotes = self.service.get_multiple_stocks(sorted(symbols)) if symbols else {}
+
+        with self._lock:
+            changed = {}
+            for symbol, quote in quotes.items():
+                fields = _quote_fields(quote)
+                if self._quotes.get(symbol) != fields:
+                    changed[symbol] = fields
+            # Only remember symbols someone still watches
+            self._quotes = {symbol: fields for symbol, fields in dict(self._quotes, **changed).items()
+                            if symbol in symbols}
+
+            # Clients that last saw the same version get the same delta
+            sector_deltas = {}
+            for subscription in self._subscribers:
+                if subscription.sector_version != snapshot.version:
+                    self._send_sector_changes(subscription, snapshot, sector_deltas)
+                delta = {symbol: changed[symbol] for symbol in subscription.symbols if symbol in changed}
+                if delta:
+                    subscription.put('quotes', {'quotes': delta})
+
+    @staticmethod
+    def _send_sectors(subscription: Subscription, snapshot):
+        subscription.put('sectors', {'version': snapshot.version, 'sectorData': snapshot.data})
+        subscription.sector_version = snapshot.version
+        subscription.sectors = _sectors_by_name(snapshot.data)
+
+    @staticmethod
+    def _send_sector_changes(subscription: Subscription, snapshot, deltas: Dict):
+        delta = deltas.get(subscription.sector_version)
+        if delta is None:
+            delta = deltas[subscription.sector_version] = dict(
+                sector_changes(subscription.sectors, snapshot.data), version=snapshot.version
+            )
+        subscription.put('sector-changes', delta)
+        subscription.sector_version = snapshot.version
+        subscription.sectors = _sectors_by_name(snapshot.data)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.publish_once()
+            except Exception as e:
+                logger.error(f"Error publishing live updates: {e}")
+
+
+# Global instance
+live_hub = LiveUpdateHub(financial_service, sector_refresher)
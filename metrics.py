@@ -0,0 +1,317 @@
+"""
+Metrics Registry for TradingGrow
+Counters and histograms, aggregated across workers and rendered in the Prometheus text exposition format
+"""
+
+import os
+import json
+import math
+import atexit
+import logging
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+from background import PerProcessThread
+
+logger = logging.getLogger(__name__)
+
+# Shared directory where every worker publishes its metrics (same variable as prometheus_client's
+# multiprocess mode); without it a scrape only sees the worker that served it
+METRICS_MULTIPROC_DIR = os.getenv('PROMETHEUS_MULTIPROC_DIR', '')
+# How often each worker writes its metrics to the shared directory
+METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', 5))
+
+# Latency buckets in seconds, from a warm cache hit up to a slow upstream timeout
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{escaped}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+
+    def empty_copy(self) -> '_Metric':
+        return type(self)(self.name, self.documentation, self.labelnames)
+
+    def dump(self) -> List:
+        """JSON-serializable series, for merging into another process's copy"""
+        raise NotImplementedError
+
+    def merge(self, dumped: List):
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set"""
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def series(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def dump(self) -> List:
+        return [[list(key), value] for key, value in self.series().items()]
+
+    def merge(self, dumped: List):
+        with self._lock:
+            for key, value in dumped:
+                key = tuple(key)
+                self._values[key] = self._values.get(key, 0) + value
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for key, value in sorted(self.series().items()):
+            lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}')
+        return lines
+
+
+class _HistogramSeries:
+    __slots__ = ('buckets', 'sum', 'count')
+
+    def __init__(self, size: int):
+        self.buckets = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observations per label set"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: Dict[Tuple[str, ...], _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self.buckets))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series.buckets[index] += 1
+                    break
+            series.sum += value
+            series.count += 1
+
+    def empty_copy(self) -> 'Histogram':
+        return Histogram(self.name, self.documentation, self.labelnames, self.buckets[:-1])
+
+    def dump(self) -> List:
+        with self._lock:
+            return [[list(key), list(series.buckets), series.sum, series.count]
+                    for key, series in self._series.items()]
+
+    def merge(self, dumped: List):
+        with self._lock:
+            for key, buckets, total, count in dumped:
+                if len(buckets) != len(self.buckets):
+                    # Written by a worker running a different bucket layout (mid-deploy); skip it
+                    continue
+                key = tuple(key)
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = _HistogramSeries(len(self.buckets))
+                series.buckets = [mine + theirs for mine, theirs in zip(series.buckets, buckets)]
+                series.sum += total
+                series.count += count
+
+    def summary(self) -> Dict[Tuple[str, ...], Dict[str, float]]:
+        """count, sum, mean and bucket-estimated p50/p95/p99 per label set"""
+        with self._lock:
+            snapshot = {key: (list(series.buckets), series.sum, series.count)
+                        for key, series in self._series.items()}
+
+        result = {}
+        for key, (buckets, total, count) in snapshot.items():
+            result[key] = {
+                'count': count,
+                'sum': total,
+                'mean': total / count if count else 0.0,
+                'p50': self._quantile(0.5, buckets, count),
+                'p95': self._quantile(0.95, buckets, count),
+                'p99': self._quantile(0.99, buckets, count)
+            }
+        return result
+
+    def _quantile(self, q: float, buckets: List[int], count: int) -> float:
+        """Linear interpolation within the bucket holding the q-th observation, like histogram_quantile()"""
+        if not count:
+            return 0.0
+        rank = q * count
+        cumulative = 0
+        lower = 0.0
+        for bound, bucket_count in zip(self.buckets, buckets):
+            if cumulative + bucket_count >= rank and bucket_count:
+                if bound == math.inf:
+                    return lower
+                return lower + (bound - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+            lower = bound if bound != math.inf else lower
+        return lower
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            snapshot = sorted((key, list(series.buckets), series.sum, series.count)
+                              for key, series in self._series.items())
+        for key, buckets, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, buckets):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames + ('le',), key + (_format_value(bound),))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class MetricsRegistry(PerProcessThread):
+    """Named metrics, aggregated across gunicorn workers
+
+    With a multiprocess directory configured, each worker writes its metrics
+    to <dir>/metrics_<pid>.json every METRICS_FLUSH_SECONDS and on exit, and
+    a scrape sums the files of every worker. Files of exited workers are kept
+    so counters stay monotonic; clear the directory before starting the
+    server. Without a directory each worker reports only itself.
+    """
+
+    thread_name = 'metrics-flusher'
+
+    def __init__(self, multiproc_dir: str = METRICS_MULTIPROC_DIR,
+                 flush_interval: float = METRICS_FLUSH_SECONDS):
+        super().__init__()
+        self.multiproc_dir = multiproc_dir
+        self.flush_interval = flush_interval
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def start(self):
+        """Start publishing this worker's metrics, if a multiprocess directory is configured"""
+        if self.multiproc_dir:
+            super().start()
+
+    def flush(self):
+        """Write this worker's metrics to the multiprocess directory"""
+        if not self.multiproc_dir:
+            return
+        with self._lock:
+            registered = list(self._metrics.values())
+        data = {metric.name: metric.dump() for metric in registered}
+        os.makedirs(self.multiproc_dir, exist_ok=True)
+        path = os.path.join(self.multiproc_dir, f'metrics_{os.getpid()}.json')
+        # Write then rename, so readers never see a half-written file
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(f'{path}.tmp', path)
+
+    def collect(self) -> Dict[str, _Metric]:
+        """Every metric by name, summed over all workers when a multiprocess directory is configured"""
+        with self._lock:
+            registered = dict(self._metrics)
+        if not self.multiproc_dir:
+            return registered
+
+        self.flush()
+        merged = {name: metric.empty_copy() for name, metric in registered.items()}
+        for filename in sorted(os.listdir(self.multiproc_dir)):
+            if not (filename.startswith('metrics_') and filename.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(self.multiproc_dir, filename)) as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable metrics file {filename}: {e}")
+                continue
+            for name, dumped in data.items():
+                if name in merged:
+                    merged[name].merge(dumped)
+        return merged
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self.collect().values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def _run(self):
+        # Publish the final counts when the worker exits (max_requests restarts, graceful shutdown)
+        atexit.register(self.flush)
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error writing metrics to {self.multiproc_dir}: {e}")
+
+    def _register(self, metric: _Metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                # Re-importing a module returns the metric it registered the first time
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+
+# Global instance
+metrics = MetricsRegistry()
@@ -0,0 +1,96 @@
+"""
+Data Migrations for TradingGrow
+Idempotent upgrades run at startup after db.create_all()
+"""
+
+import json
+import logging
+
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+
+def migrate_watchlist_blobs(db):
+    """Move stocks from the legacy Watchlist.stocks_json blob into watchlist_items rows"""
+    from models import Watchlist, WatchlistItem
+
+    pending = Watchlist.query.filter(
+        Watchlist.stocks_json.isnot(None),
+        Watchlist.stocks_json.notin_(['', '[]'])
+    )
+
+    migrated = 0
+    while True:
+        # Migrated rows drop out of the filter, so each batch starts from the top
+        batch = pending.limit(500).all()
+        if not batch:
+            break
+
+        for watchlist in batch:
+            try:
+                stocks = json.loads(watchlist.stocks_json)
+            except (json.JSONDecodeError, TypeError):
+                logger.warning(f"Skipping unreadable stocks_json on watchlist {watchlist.id}")
+                stocks = []
+
+            existing = {item.symbol for item in watchlist.items}
+            for stock in stocks:
+                symbol = stock.get('symbol') if isinstance(stock, dict) else None
+                if symbol and symbol not in existing:
+                    db.session.add(WatchlistItem(symbol, stock, watchlist_id=watchlist.id))
+                    existing.add(symbol)
+
+            watchlist.stocks_json = '[]'
+
+        db.session.commit()
+        migrated += len(batch)
+
+    if migrated:
+        logger.info(f"Migrated {migrated} watchlists to watchlist_items")
+
+
+def ensure_indexes(db):
+    """Create indexes declared on the models that existing tables are missing
+
+    db.create_all() only creates indexes together with new tables.
+    """
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+
+
+def ensure_columns(db):
+    """Add nullable columns declared on the models that existing tables are missing
+
+    db.create_all() never alters a table it finds already created.
+    """
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            if not column.nullable:
+                logger.warning(f"Cannot add NOT NULL column {table.name}.{column.name} automatically")
+                continue
+            quote = db.engine.dialect.identifier_preparer.quote
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            with db.engine.begin() as conn:
+                conn.execute(text(f'ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}'))
+            logger.info(f"Added column {table.name}.{column.name}")
+
+
+def run_migrations(db):
+    """Run all data migrations; each one is safe to repeat"""
+    from stock_catalog import seed_stock_catalog
+
+    for migration in (ensure_columns, ensure_indexes, migrate_watchlist_blobs, seed_stock_catalog):
+        try:
+            migration(db)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Data migration {migration.__name__} failed: {e}")
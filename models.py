@@ -1,21 +1,28 @@
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import flag_modified
+from datetime import datetime, timedelta
 import uuid
 import json
 
+from events import user_tiers_changed
+
 
 def init_models(db):
     """Initialize models with database instance"""
     
     class User(UserMixin, db.Model):
         __tablename__ = 'users'
+        # Keyset pagination order for the admin user listing
+        __table_args__ = (db.Index('ix_users_created_at_id', 'created_at', 'id'),)
         
         id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
         email = db.Column(db.String(120), unique=True, nullable=False)
         full_name = db.Column(db.String(100), nullable=True)
         password_hash = db.Column(db.String(256), nullable=True)
-        subscription_tier = db.Column(db.String(20), default='free')
+        subscription_tier = db.Column(db.String(20), default='free', index=True)
         is_admin = db.Column(db.Boolean, default=False)  # Admin flag
         created_at = db.Column(db.DateTime, default=datetime.utcnow)
         updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -59,6 +66,48 @@ def init_models(db):
             """Get all users for admin management"""
             return User.query.all()
         
+        @staticmethod
+        def filtered_query(tier=None, email_prefix=None):
+            """Users query narrowed by subscription tier and/or email prefix"""
+            query = User.query
+            if tier:
+                query = query.filter(User.subscription_tier == tier)
+            if email_prefix:
+                query = query.filter(User.email.startswith(email_prefix, autoescape=True))
+            return query
+        
+        @staticmethod
+        def get_tier_counts():
+            """Number of users per subscription tier, from one GROUP BY query"""
+            rows = db.session.query(User.subscription_tier, db.func.count(User.id)).group_by(
+                User.subscription_tier
+            ).all()
+            counts = {'free': 0, 'medium': 0, 'pro': 0}
+            for tier, count in rows:
+                tier = tier or 'free'
+                counts[tier] = counts.get(tier, 0) + count
+            return counts
+        
+        @staticmethod
+        def bulk_update_tier(from_tier, to_tier):
+            """Move every non-admin user on from_tier to to_tier with one UPDATE; returns the row count"""
+            tier_filter = User.subscription_tier == from_tier
+            if from_tier == 'free':
+                tier_filter = db.or_(tier_filter, User.subscription_tier.is_(None))
+            
+            stmt = update(User).where(tier_filter, User.is_admin.is_not(True)).values(
+                subscription_tier=to_tier, updated_at=datetime.utcnow()
+            ).execution_options(synchronize_session=False)
+            try:
+                count = db.session.execute(stmt).rowcount
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                raise e
+            
+            user_tiers_changed.send(User, from_tier=from_tier, to_tier=to_tier, count=count)
+            return count
+        
         @staticmethod
         def create_admin(email, password, full_name=None):
             """Create an admin user"""
@@ -71,6 +120,16 @@ def init_models(db):
             self.updated_at = datetime.utcnow()
             return self.save()
 
+        def to_dict(self):
+            return {
+                'id': self.id,
+                'email': self.email,
+                'full_name': self.full_name,
+                'subscription_tier': self.subscription_tier,
+                'is_admin': self.is_admin,
+                'created_at': self.created_at.isoformat() if self.created_at else None
+            }
+
         def get_id(self):
             return self.id
         
@@ -85,13 +144,24 @@ def init_models(db):
     class Watchlist(db.Model):
         __tablename__ = 'watchlists'
         
+        # Default names for the watchlists every user starts with
+        DEFAULT_NAMES = {
+            'breakout': 'Breakout Watchlist',
+            'speculative': 'Speculative Watchlist',
+            'normal': 'Normal Watchlist'
+        }
+        
         id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
         name = db.Column(db.String(100), nullable=False)
         user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
         watchlist_type = db.Column(db.String(20), default='normal')  # 'breakout', 'speculative', 'normal'
-        stocks_json = db.Column(db.Text, default='[]')  # JSON string to store stocks data
+        stocks_json = db.Column(db.Text, default='[]')  # Legacy blob, migrated into watchlist_items
         created_at = db.Column(db.DateTime, default=datetime.utcnow)
         updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+        
+        # One row per stock, in insertion order
+        items = db.relationship('WatchlistItem', backref='watchlist', lazy=True,
+                                cascade='all, delete-orphan', order_by='WatchlistItem.id')
 
         def __init__(self, name, user_id, watchlist_type='normal', **kwargs):
             super().__init__(**kwargs)
@@ -100,31 +170,54 @@ def init_models(db):
             self.watchlist_type = watchlist_type
             self.stocks_json = '[]'
 
+        @property
+        def stock_index(self):
+            """Symbol -> WatchlistItem, built once per load and kept in step with writes"""
+            index = self.__dict__.get('_stock_index')
+            if index is None:
+                index = {item.symbol: item for item in self.items}
+                self._stock_index = index
+            return index
+
         @property
         def stocks(self):
-            """Get stocks as a list from JSON string"""
-            try:
-                return json.loads(self.stocks_json or '[]')
-            except (json.JSONDecodeError, TypeError):
-                return []
+            """Get stocks as a list of dicts"""
+            return [item.to_dict() for item in self.stock_index.values()]
 
         @stocks.setter
         def stocks(self, value):
-            """Set stocks as JSON string from list"""
-            self.stocks_json = json.dumps(value or [])
+            """Replace all stocks from a list of dicts"""
+            by_symbol = {stock.get('symbol'): stock for stock in value or [] if stock.get('symbol')}
+            self.items = [WatchlistItem(symbol, stock) for symbol, stock in by_symbol.items()]
+            self._stock_index = None
+
+        def has_stock(self, symbol):
+            """O(1) membership check against the cached symbol index"""
+            return symbol in self.stock_index
 
         def add_stock(self, stock_data):
-            """Add a stock to the watchlist"""
-            current_stocks = self.stocks
-            current_stocks.append(stock_data)
-            self.stocks = current_stocks
+            """Add a stock to the watchlist as a single row"""
+            # Setting the backref queues the insert without loading the other items
+            item = WatchlistItem(stock_data.get('symbol'), stock_data)
+            item.watchlist = self
+            if inspect(self).persistent:
+                db.session.add(item)
+            index = self.__dict__.get('_stock_index')
+            if index is not None:
+                index[item.symbol] = item
             self.updated_at = datetime.utcnow()
 
         def remove_stock(self, symbol):
             """Remove a stock from the watchlist by symbol"""
-            current_stocks = self.stocks
-            current_stocks = [stock for stock in current_stocks if stock.get('symbol') != symbol]
-            self.stocks = current_stocks
+            state = inspect(self)
+            if state.persistent and 'items' in state.unloaded:
+                WatchlistItem.query.filter_by(watchlist_id=self.id, symbol=symbol).delete(synchronize_session=False)
+            else:
+                for item in [item for item in self.items if item.symbol == symbol]:
+                    self.items.remove(item)
+            index = self.__dict__.get('_stock_index')
+            if index is not None:
+                index.pop(symbol, None)
             self.updated_at = datetime.utcnow()
 
         def save(self):
@@ -148,12 +241,130 @@ def init_models(db):
         def get_by_user_and_type(user_id, watchlist_type):
             return Watchlist.query.filter_by(user_id=user_id, watchlist_type=watchlist_type).all()
 
+        @staticmethod
+        def get_grouped_by_user(user_id):
+            """Get all of a user's watchlists with their stocks in one query, grouped by type"""
+            watchlists = Watchlist.query.options(joinedload(Watchlist.items)).filter_by(
+                user_id=user_id
+            ).order_by(Watchlist.created_at).all()
+            
+            grouped = {watchlist_type: [] for watchlist_type in Watchlist.DEFAULT_NAMES}
+            for watchlist in watchlists:
+                grouped.setdefault(watchlist.watchlist_type, []).append(watchlist)
+            return grouped
+
+        @staticmethod
+        def create_defaults(user_id, stocks_by_type):
+            """Create the default watchlists and their stocks in one flush and one commit"""
+            watchlists = []
+            for watchlist_type, stocks in stocks_by_type.items():
+                name = Watchlist.DEFAULT_NAMES.get(watchlist_type, f'{watchlist_type.title()} Watchlist')
+                watchlist = Watchlist(name, user_id, watchlist_type)
+                watchlist.stocks = stocks
+                watchlists.append(watchlist)
+            
+            try:
+                db.session.add_all(watchlists)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                raise e
+            
+            # Committed objects are expired; re-read them in one query rather than one per watchlist
+            return Watchlist.get_grouped_by_user(user_id)
+
         def __repr__(self):
             return f'<Watchlist {self.name} ({self.watchlist_type})>'
+
+
+    class WatchlistItem(db.Model):
+        __tablename__ = 'watchlist_items'
+        __table_args__ = (
+            db.UniqueConstraint('watchlist_id', 'symbol', name='uq_watchlist_items_watchlist_symbol'),
+        )
+        
+        id = db.Column(db.Integer, primary_key=True)  # Autoincrement keeps insertion order
+        watchlist_id = db.Column(db.String(36), db.ForeignKey('watchlists.id'), nullable=False)
+        symbol = db.Column(db.String(20), nullable=False, index=True)  # Reverse index: symbol -> watchers
+        data_json = db.Column(db.Text, default='{}')  # Remaining stock fields such as buy_point
+        created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+        def __init__(self, symbol, stock_data=None, **kwargs):
+            super().__init__(**kwargs)
+            self.symbol = symbol
+            self.data = stock_data or {}
+
+        @property
+        def data(self):
+            """Get stock fields, parsing data_json at most once per load"""
+            data = self.__dict__.get('_data')
+            if data is None:
+                try:
+                    data = json.loads(self.data_json or '{}')
+                except (json.JSONDecodeError, TypeError):
+                    data = {}
+                self._data = data
+            return data
+
+        @data.setter
+        def data(self, value):
+            """Set stock fields, keeping the symbol in its own column; serialized on flush"""
+            self._data = {k: v for k, v in (value or {}).items() if k != 'symbol'}
+            if inspect(self).persistent:
+                flag_modified(self, 'data_json')
+
+        def to_dict(self):
+            return dict(self.data, symbol=self.symbol)
+
+        @staticmethod
+        def get_watcher_ids(symbol):
+            """Get ids of users with the symbol in any of their watchlists"""
+            rows = db.session.query(Watchlist.user_id).join(WatchlistItem).filter(
+                WatchlistItem.symbol == symbol
+            ).distinct().all()
+            return [row.user_id for row in rows]
+
+        @staticmethod
+        def get_symbols_for_user(user_id):
+            """Get the distinct symbols across all of a user's watchlists"""
+            rows = db.session.query(WatchlistItem.symbol).join(Watchlist).filter(
+                Watchlist.user_id == user_id
+            ).distinct().all()
+            return [row.symbol for row in rows]
+
+        def __repr__(self):
+            return f'<WatchlistItem {self.symbol} in {self.watchlist_id}>'
+
+    @event.listens_for(WatchlistItem, 'before_insert')
+    @event.listens_for(WatchlistItem, 'before_update')
+    def serialize_watchlist_item(mapper, connection, target):
+        """Write the parsed stock fields back to data_json only when flushing"""
+        data = target.__dict__.get('_data')
+        if data is not None:
+            target.data_json = json.dumps(data)
+
+    @event.listens_for(Watchlist, 'expire')
+    @event.listens_for(Watchlist, 'refresh')
+    def reset_stock_index(target, *args):
+        """Drop the cached symbol index whenever the row is reloaded"""
+        if target is not None:
+            target.__dict__.pop('_stock_index', None)
+
+    @event.listens_for(WatchlistItem, 'expire')
+    @event.listens_for(WatchlistItem, 'refresh')
+    def reset_item_data(target, *args):
+        """Drop the parsed stock fields whenever the row is reloaded"""
+        if target is not None:
+            target.__dict__.pop('_data', None)
     
     
     class SubscriptionRequest(db.Model):
         __tablename__ = 'subscription_requests'
+        # Pending-queue listing: filter on status, keyset page on (created_at, id)
+        __table_args__ = (db.Index('ix_subscription_requests_status_created_at', 'status', 'created_at', 'id'),)
+        
+        # Ids per IN list in batch approve/reject, well under driver parameter limits
+        BATCH_CHUNK_SIZE = 500
         
         id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
         user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -194,14 +405,41 @@ def init_models(db):
         def get_by_user(user_id):
             return SubscriptionRequest.query.filter_by(user_id=user_id).order_by(SubscriptionRequest.created_at.desc()).all()
         
+        @staticmethod
+        def get_pending_page(cursor=None, limit=50):
+            """One newest-first page of pending requests with their users, in a single joined query"""
+            from pagination import paginate_keyset
+            query = SubscriptionRequest.query.filter_by(status='pending').options(
+                joinedload(SubscriptionRequest.user)
+            )
+            return paginate_keyset(query, (SubscriptionRequest.created_at, SubscriptionRequest.id), cursor, limit)
+        
+        def to_dict(self):
+            user = self.user
+            return {
+                'id': self.id,
+                'user_id': self.user_id,
+                'user_name': (user.full_name or user.email.split('@')[0]) if user else 'Unknown',
+                'user_email': user.email if user else 'Unknown',
+                'current_tier': self.current_tier,
+                'requested_tier': self.requested_tier,
+                'status': self.status,
+                'created_at': self.created_at.isoformat() if self.created_at else None
+            }
+        
         def approve(self):
-            """Approve the subscription request and update user tier"""
+            """Approve the subscription request and update user tier, in one commit"""
             self.status = 'approved'
             self.updated_at = datetime.utcnow()
-            user = User.get(self.user_id)
+            user = self.user
+            from_tier = user.subscription_tier if user else None
             if user:
-                user.update_subscription(self.requested_tier)
-            return self.save()
+                user.subscription_tier = self.requested_tier
+                user.updated_at = self.updated_at
+            self.save()
+            if user:
+                user_tiers_changed.send(User, from_tier=from_tier, to_tier=self.requested_tier, count=1)
+            return self
         
         def reject(self):
             """Reject the subscription request"""
@@ -209,6 +447,59 @@ def init_models(db):
             self.updated_at = datetime.utcnow()
             return self.save()
         
+        @staticmethod
+        def resolve_many(request_ids, action):
+            """Approve or reject many pending requests in one transaction
+            
+            Ids go to the database in chunked IN lists. An UPDATE ... RETURNING
+            per chunk claims the requests that are still pending, then a users
+            UPDATE per requested tier applies the claimed ones, then a single
+            commit. Only requests this call moved out of 'pending' change a
+            tier, so one resolved concurrently by another admin is skipped like
+            an unknown id. Returns the ids resolved.
+            """
+            if action not in ('approve', 'reject'):
+                raise ValueError(f'Invalid action: {action}')
+            
+            request_ids = list(dict.fromkeys(request_ids))
+            chunks = [request_ids[i:i + SubscriptionRequest.BATCH_CHUNK_SIZE]
+                      for i in range(0, len(request_ids), SubscriptionRequest.BATCH_CHUNK_SIZE)]
+            status = 'approved' if action == 'approve' else 'rejected'
+            now = datetime.utcnow()
+            
+            try:
+                claimed = []
+                for chunk in chunks:
+                    claimed.extend(db.session.execute(update(SubscriptionRequest).where(
+                        SubscriptionRequest.id.in_(chunk), SubscriptionRequest.status == 'pending'
+                    ).values(status=status, updated_at=now).returning(
+                        SubscriptionRequest.id, SubscriptionRequest.user_id, SubscriptionRequest.requested_tier,
+                        SubscriptionRequest.created_at
+                    ).execution_options(synchronize_session=False)).all())
+                # Oldest first across all chunks, so later entries below are the newer requests
+                claimed.sort(key=lambda row: (row.created_at or datetime.min, row.id))
+                resolved_ids = [row.id for row in claimed]
+                
+                users_by_tier = {}
+                if action == 'approve':
+                    # A user's newest request wins if several are approved together
+                    tier_by_user = {row.user_id: row.requested_tier for row in claimed}
+                    for user_id, tier in tier_by_user.items():
+                        users_by_tier.setdefault(tier, []).append(user_id)
+                    for tier, user_ids in users_by_tier.items():
+                        for i in range(0, len(user_ids), SubscriptionRequest.BATCH_CHUNK_SIZE):
+                            db.session.execute(update(User).where(
+                                User.id.in_(user_ids[i:i + SubscriptionRequest.BATCH_CHUNK_SIZE])
+                            ).values(subscription_tier=tier, updated_at=now).execution_options(synchronize_session=False))
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                raise e
+            
+            for tier, user_ids in users_by_tier.items():
+                user_tiers_changed.send(User, from_tier=None, to_tier=tier, count=len(user_ids))
+            return resolved_ids
+        
         def __repr__(self):
             return f'<SubscriptionRequest {self.user_id} -> {self.requested_tier}>'
 
@@ -276,11 +567,194 @@ def init_models(db):
         def __repr__(self):
             return f'<StockScreening {self.name}>'
 
-    return User, Watchlist, StockScreening, SubscriptionRequest
+    
+    class Stock(db.Model):
+        __tablename__ = 'stocks'
+        
+        id = db.Column(db.Integer, primary_key=True)
+        symbol = db.Column(db.String(20), unique=True, nullable=False)
+        name = db.Column(db.String(200), nullable=False)
+        sector = db.Column(db.String(100), nullable=True, index=True)
+        industry_type = db.Column(db.String(100), nullable=True, index=True)
+        industry_code = db.Column(db.String(20), nullable=True)
+        price = db.Column(db.Float, default=0.0)
+        change_percent = db.Column(db.Float, default=0.0)
+        created_at = db.Column(db.DateTime, default=datetime.utcnow)
+        updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+        
+        def __init__(self, symbol, name, **kwargs):
+            super().__init__(**kwargs)
+            self.symbol = symbol.upper()
+            self.name = name
+        
+        def to_dict(self):
+            """Stock in the catalog's JSON shape (ids are strings in the API)"""
+            data = {
+                'id': str(self.id),
+                'symbol': self.symbol,
+                'name': self.name,
+                'sector': self.sector or '',
+                'price': self.price or 0.0,
+                'change_percent': self.change_percent or 0.0
+            }
+            # Stocks added without an industry are grouped under the endpoints' defaults
+            if self.industry_type is not None:
+                data['industry_type'] = self.industry_type
+            if self.industry_code is not None:
+                data['industry_code'] = self.industry_code
+            return data
+        
+        def save(self):
+            try:
+                db.session.add(self)
+                db.session.commit()
+                return self
+            except Exception as e:
+                db.session.rollback()
+                raise e
+        
+        def delete(self):
+            try:
+                db.session.delete(self)
+                db.session.commit()
+                return True
+            except Exception as e:
+                db.session.rollback()
+                raise e
+        
+        @staticmethod
+        def get(stock_id):
+            try:
+                return db.session.get(Stock, int(stock_id))
+            except (TypeError, ValueError):
+                return None
+        
+        @staticmethod
+        def get_by_symbol(symbol):
+            return Stock.query.filter_by(symbol=symbol.upper()).first()
+        
+        @staticmethod
+        def get_catalog_version():
+            """Cheap change marker for the whole table: row count and latest write"""
+            count, latest = db.session.query(db.func.count(Stock.id), db.func.max(Stock.updated_at)).one()
+            return (count, latest.isoformat() if latest else None)
+        
+        def __repr__(self):
+            return f'<Stock {self.symbol}>'
+
+    
+    class ImportJob(db.Model):
+        __tablename__ = 'import_jobs'
+        
+        id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+        kind = db.Column(db.String(30), default='stocks')
+        filename = db.Column(db.String(255), nullable=True)
+        status = db.Column(db.String(20), default='queued')  # 'queued', 'running', 'completed', 'failed'
+        bytes_total = db.Column(db.Integer, default=0)
+        bytes_read = db.Column(db.Integer, default=0)
+        rows_read = db.Column(db.Integer, default=0)
+        processed = db.Column(db.Integer, default=0)
+        error_count = db.Column(db.Integer, default=0)
+        errors_json = db.Column(db.Text, default='[]')  # First STOCK_IMPORT_MAX_ERRORS row errors
+        message = db.Column(db.Text, nullable=True)
+        created_at = db.Column(db.DateTime, default=datetime.utcnow)
+        started_at = db.Column(db.DateTime, nullable=True)
+        finished_at = db.Column(db.DateTime, nullable=True)
+        # Refreshed by the worker process that holds the job; stops moving if that process dies
+        heartbeat_at = db.Column(db.DateTime, nullable=True)
+        
+        ACTIVE_STATUSES = ('queued', 'running')
+        
+        def __init__(self, filename=None, kind='stocks', bytes_total=0, **kwargs):
+            super().__init__(**kwargs)
+            self.filename = filename
+            self.kind = kind
+            self.bytes_total = bytes_total
+            self.status = 'queued'
+            self.heartbeat_at = datetime.utcnow()
+        
+        @property
+        def errors(self):
+            try:
+                return json.loads(self.errors_json or '[]')
+            except (json.JSONDecodeError, TypeError):
+                return []
+        
+        def expire_if_stale(self, max_age_seconds):
+            """Mark a queued or running job failed once its worker stopped sending heartbeats"""
+            if self.status not in ImportJob.ACTIVE_STATUSES:
+                return False
+            last_seen = self.heartbeat_at or self.created_at
+            if last_seen is None or datetime.utcnow() - last_seen < timedelta(seconds=max_age_seconds):
+                return False
+            self.status = 'failed'
+            self.message = 'Import interrupted: the server process running it stopped. Please upload the file again.'
+            self.finished_at = datetime.utcnow()
+            self.save()
+            return True
+        
+        @staticmethod
+        def heartbeat(job_ids):
+            """Record that the calling process still holds these jobs"""
+            if not job_ids:
+                return
+            db.session.execute(update(ImportJob).where(
+                ImportJob.id.in_(list(job_ids)), ImportJob.status.in_(ImportJob.ACTIVE_STATUSES)
+            ).values(heartbeat_at=datetime.utcnow()).execution_options(synchronize_session=False))
+            db.session.commit()
+        
+        def record_progress(self, result, bytes_read):
+            """Copy running totals from a stock_import.ImportResult"""
+            self.rows_read = result.rows_read
+            self.processed = result.processed
+            self.error_count = result.error_count
+            self.errors_json = json.dumps(result.errors)
+            self.bytes_read = bytes_read
+        
+        def to_dict(self, max_errors=10):
+            progress = 100.0 if self.status == 'completed' else (
+                round(100.0 * self.bytes_read / self.bytes_total, 1) if self.bytes_total else 0.0
+            )
+            return {
+                'id': self.id,
+                'kind': self.kind,
+                'filename': self.filename,
+                'status': self.status,
+                'progress': min(progress, 100.0),
+                'rows_read': self.rows_read,
+                'processed': self.processed,
+                'errors': self.error_count,
+                'error_details': self.errors[:max_errors],
+                'message': self.message,
+                'created_at': self.created_at.isoformat() if self.created_at else None,
+                'started_at': self.started_at.isoformat() if self.started_at else None,
+                'finished_at': self.finished_at.isoformat() if self.finished_at else None
+            }
+        
+        def save(self):
+            try:
+                db.session.add(self)
+                db.session.commit()
+                return self
+            except Exception as e:
+                db.session.rollback()
+                raise e
+        
+        @staticmethod
+        def get(job_id):
+            return db.session.get(ImportJob, job_id)
+        
+        def __repr__(self):
+            return f'<ImportJob {self.id} {self.status}>'
+
+    return User, Watchlist, WatchlistItem, StockScreening, SubscriptionRequest, Stock, ImportJob
 
 
 # Placeholder for models - will be set by init_models()
 User = None
 Watchlist = None
+WatchlistItem = None
 StockScreening = None
-SubscriptionRequest = None
\ No newline at end of file
+SubscriptionRequest = None
+Stock = None
+ImportJob = None
\ No newline at end of file
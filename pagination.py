@@ -0,0 +1,69 @@
+"""
+Keyset Pagination for TradingGrow
+Opaque cursors for paging newest-first through large tables without OFFSET scans
+"""
+
+import json
+import base64
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def page_limit(value: Optional[int], default: int = DEFAULT_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE) -> int:
+    """Clamp a requested page size"""
+    if not value or value < 1:
+        return default
+    return min(value, maximum)
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str, columns: Sequence) -> List:
+    """Decode a cursor back into typed key values (raises ValueError if it is malformed)"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f'Invalid cursor: {e}')
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError('Invalid cursor')
+
+    decoded = []
+    for column, value in zip(columns, values):
+        expected = column.type.python_type
+        try:
+            if expected is datetime:
+                value = datetime.fromisoformat(value)
+            elif not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+                raise TypeError(f'expected {expected.__name__}')
+        except (TypeError, ValueError):
+            raise ValueError('Invalid cursor')
+        decoded.append(value)
+    return decoded
+
+
+def paginate_keyset(query, columns: Sequence, cursor: Optional[str] = None,
+                    limit: int = DEFAULT_PAGE_SIZE) -> Tuple[list, Optional[str]]:
+    """Return one newest-first page of query ordered by columns, plus the cursor for the next page
+
+    columns must end in a unique column (e.g. (created_at, id)) and should be
+    backed by a matching index, so each page is an index range scan however
+    deep the client has paged.
+    """
+    if cursor:
+        query = query.filter(tuple_(*columns) < tuple(decode_cursor(cursor, columns)))
+
+    rows = query.order_by(*[column.desc() for column in columns]).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, column.key) for column in columns])
@@ -0,0 +1,366 @@
+"""
+Quote Cache for TradingGrow
+Shared TTL cache with single-flight loading in front of the financial data providers
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from metrics import metrics
+
+# Optional import for the shared Redis backend
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Default time-to-live in seconds for each cached FinancialDataService method
+DEFAULT_TTLS = {
+    'stock_data': 60,
+    'multiple_stocks': 30,
+    'sector_performance': 60,
+    'market_overview': 30,
+    'reference_data': 86400,
+}
+
+# Sentinel for cache misses (None is a legitimate cached value)
+MISSING = object()
+
+QUOTE_CACHE_LOOKUPS = metrics.counter(
+    'tradinggrow_quote_cache_lookups_total', 'Quote cache lookups by method and result (hit or miss)',
+    ('method', 'result')
+)
+
+
+class LRUCacheBackend:
+    """In-process LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def get_many(self, keys: List[str]) -> List[Any]:
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def acquire_lock(self, key: str, timeout: float) -> Optional[str]:
+        """Process-local coalescing already happens in QuoteCache"""
+        return 'local'
+
+    def release_lock(self, key: str, token: str):
+        pass
+
+
+class RedisCacheBackend:
+    """Redis-backed cache shared by every gunicorn worker"""
+
+    def __init__(self, url: str, prefix: str = 'tradinggrow:quotes:'):
+        self.client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Any:
+        try:
+            raw = self.client.get(self.prefix + key)
+        except redis.RedisError as e:
+            logger.warning(f"Redis cache read failed for {key}: {e}")
+            return MISSING
+        return MISSING if raw is None else json.loads(raw)
+
+    def get_many(self, keys: List[str]) -> List[Any]:
+        if not keys:
+            return []
+        try:
+            raws = self.client.mget([self.prefix + key for key in keys])
+        except redis.RedisError as e:
+            logger.warning(f"Redis cache batch read failed: {e}")
+            return [MISSING] * len(keys)
+        return [MISSING if raw is None else json.loads(raw) for raw in raws]
+
+    def set(self, key: str, value: Any, ttl: float):
+        try:
+            self.client.set(self.prefix + key, json.dumps(value, default=str), px=max(1, int(ttl * 1000)))
+        except redis.RedisError as e:
+            logger.warning(f"Redis cache write failed for {key}: {e}")
+
+    def delete(self, key: str):
+        try:
+            self.client.delete(self.prefix + key)
+        except redis.RedisError as e:
+            logger.warning(f"Redis cache delete failed for {key}: {e}")
+
+    def clear(self):
+        try:
+            keys = list(self.client.scan_iter(match=self.prefix + '*'))
+            if keys:
+                self.client.delete(*keys)
+        except redis.RedisError as e:
+            logger.warning(f"Redis cache clear failed: {e}")
+
+    def acquire_lock(self, key: str, timeout: float) -> Optional[str]:
+        """Take the cross-worker fetch lock for a key, returning its token"""
+        token = str(uuid.uuid4())
+        try:
+            acquired = self.client.set(f"{self.prefix}{key}:lock", token, nx=True, px=max(1, int(timeout * 1000)))
+        except redis.RedisError as e:
+            logger.warning(f"Redis lock failed for {key}: {e}")
+            return 'unlocked'
+        return token if acquired else None
+
+    def release_lock(self, key: str, token: str):
+        lock_key = f"{self.prefix}{key}:lock"
+        try:
+            if self.client.get(lock_key) == token.encode():
+                self.client.delete(lock_key)
+        except redis.RedisError as e:
+            logger.warning(f"Redis unlock failed for {key}: {e}")
+
+
+class _Flight:
+    """A single in-progress upstream fetch that other threads can wait on"""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self.value = MISSING
+        self.error = None
+
+    def resolve(self, value):
+        self.value = value
+        self._done.set()
+
+    def fail(self, error):
+        self.error = error
+        self._done.set()
+
+    def wait(self, timeout: float) -> Any:
+        """The leader's value, or MISSING if it failed or is still loading after timeout"""
+        if not self._done.wait(timeout) or self.error is not None:
+            return MISSING
+        return self.value
+
+
+class QuoteCache:
+    """TTL cache with single-flight request coalescing
+
+    Concurrent misses for the same key wait on one upstream fetch instead of
+    each issuing their own. If that fetch fails or outlasts lock_timeout, the
+    waiters do not retry it themselves (that would multiply the load on a
+    struggling provider): they get the caller's fallback, or else the
+    leader's error. Cached values are shared between callers and must be
+    treated as read-only.
+    """
+
+    def __init__(self, backend, ttls: Optional[Dict[str, float]] = None, lock_timeout: float = 15.0):
+        self.backend = backend
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.lock_timeout = lock_timeout
+        self._inflight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def ttl_for(self, method: str) -> float:
+        return self.ttls.get(method, 30)
+
+    def get_or_load(self, method: str, key: str, loader: Callable[[], Any],
+                    fallback: Optional[Callable[[], Any]] = None) -> Any:
+        """Return the cached value for key, calling loader at most once per process on a miss
+
+        fallback (which must not call upstream) answers the callers that waited
+        on a fetch that failed or timed out; it is not cached.
+        """
+        cache_key = f"{method}:{key}"
+        value = self.backend.get(cache_key)
+        if value is not MISSING:
+            QUOTE_CACHE_LOOKUPS.inc(method=method, result='hit')
+            return value
+        QUOTE_CACHE_LOOKUPS.inc(method=method, result='miss')
+
+        with self._lock:
+            flight = self._inflight.get(cache_key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[cache_key] = flight
+
+        if not leader:
+            value = flight.wait(self.lock_timeout)
+            if value is not MISSING:
+                return value
+            if fallback is not None:
+                return fallback()
+            if flight.error is not None:
+                raise flight.error
+            raise TimeoutError(f"Timed out waiting for in-flight fetch of {cache_key}")
+
+        try:
+            value = self._load_with_lock(cache_key, loader)
+            self.backend.set(cache_key, value, self.ttl_for(method))
+            flight.resolve(value)
+            return value
+        except BaseException as e:
+            flight.fail(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(cache_key, None)
+
+    def get_many(self, method: str, keys: Iterable[str],
+                 loader: Callable[[List[str]], Dict[str, Any]],
+                 fallback: Optional[Callable[[List[str]], Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Batch lookup: only keys that are neither cached nor already in flight reach the loader
+
+        Keys whose in-flight fetch failed or timed out come from fallback, or
+        are left out of the result like keys the loader did not return.
+        """
+        keys = list(dict.fromkeys(keys))
+        cache_keys = [f"{method}:{key}" for key in keys]
+        results = {}
+        missing = []
+        for key, value in zip(keys, self.backend.get_many(cache_keys)):
+            if value is MISSING:
+                missing.append(key)
+            else:
+                results[key] = value
+        if results:
+            QUOTE_CACHE_LOOKUPS.inc(len(results), method=method, result='hit')
+        if missing:
+            QUOTE_CACHE_LOOKUPS.inc(len(missing), method=method, result='miss')
+
+        if not missing:
+            return results
+
+        owned, waiting = [], []
+        with self._lock:
+            for key in missing:
+                cache_key = f"{method}:{key}"
+                flight = self._inflight.get(cache_key)
+                if flight is None:
+                    flight = _Flight()
+                    self._inflight[cache_key] = flight
+                    owned.append((key, flight))
+                else:
+                    waiting.append((key, flight))
+
+        if owned:
+            ttl = self.ttl_for(method)
+            try:
+                loaded = loader([key for key, _ in owned])
+                for key, flight in owned:
+                    value = loaded.get(key, MISSING)
+                    if value is MISSING:
+                        flight.fail(KeyError(key))
+                        continue
+                    self.backend.set(f"{method}:{key}", value, ttl)
+                    flight.resolve(value)
+                    results[key] = value
+            except BaseException as e:
+                for _, flight in owned:
+                    flight.fail(e)
+                raise
+            finally:
+                with self._lock:
+                    for key, _ in owned:
+                        self._inflight.pop(f"{method}:{key}", None)
+
+        unresolved = []
+        for key, flight in waiting:
+            value = flight.wait(self.lock_timeout)
+            if value is MISSING:
+                unresolved.append(key)
+            else:
+                results[key] = value
+
+        if unresolved and fallback is not None:
+            results.update(fallback(unresolved))
+
+        return results
+
+    def invalidate(self, method: str, key: str):
+        self.backend.delete(f"{method}:{key}")
+
+    def clear(self):
+        self.backend.clear()
+
+    def _load_with_lock(self, cache_key: str, loader: Callable[[], Any]) -> Any:
+        """Coalesce across workers: wait for whichever worker holds the fetch lock"""
+        token = self.backend.acquire_lock(cache_key, self.lock_timeout)
+        if token is not None:
+            try:
+                return loader()
+            finally:
+                self.backend.release_lock(cache_key, token)
+
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = self.backend.get(cache_key)
+            if value is not MISSING:
+                return value
+
+        logger.warning(f"Timed out waiting for shared fetch of {cache_key}, fetching directly")
+        return loader()
+
+
+def build_quote_cache() -> QuoteCache:
+    """Create the quote cache from environment settings
+
+    QUOTE_CACHE_BACKEND selects 'memory' or 'redis' (default: redis when
+    REDIS_URL is set). QUOTE_CACHE_TTL_<METHOD> overrides a per-method TTL.
+    """
+    redis_url = os.getenv('REDIS_URL')
+    backend_name = os.getenv('QUOTE_CACHE_BACKEND', 'redis' if redis_url else 'memory').lower()
+
+    ttls = {}
+    for method in DEFAULT_TTLS:
+        override = os.getenv(f"QUOTE_CACHE_TTL_{method.upper()}")
+        if override:
+            ttls[method] = float(override)
+
+    backend = None
+    if backend_name == 'redis':
+        if not REDIS_AVAILABLE:
+            logger.warning("redis library not installed. Using in-process quote cache.")
+        elif not redis_url:
+            logger.warning("REDIS_URL not set. Using in-process quote cache.")
+        else:
+            backend = RedisCacheBackend(redis_url)
+
+    if backend is None:
+        backend = LRUCacheBackend(max_entries=int(os.getenv('QUOTE_CACHE_MAX_ENTRIES', 2048)))
+
+    return QuoteCache(backend, ttls=ttls)
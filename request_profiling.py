@@ -0,0 +1,154 @@
+"""
+Request Profiling for TradingGrow
+Per-endpoint latency, SQL statement counts and response sizes, with an opt-in Server-Timing breakdown
+"""
+
+import os
+import time
+import logging
+from typing import Dict, Optional
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Requests issuing more statements than this are logged as likely N+1 queries
+REQUEST_SQL_WARN_COUNT = int(os.getenv('REQUEST_SQL_WARN_COUNT', 50))
+# Honour the X-Debug-Timing request header outside debug mode (it reveals query counts)
+REQUEST_TIMING_HEADER_ENABLED = os.getenv('REQUEST_TIMING_HEADER_ENABLED', 'false').lower() == 'true'
+DEBUG_TIMING_HEADER = 'X-Debug-Timing'
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+HTTP_REQUESTS = metrics.counter(
+    'tradinggrow_http_requests_total', 'HTTP requests by endpoint, method and status code',
+    ('endpoint', 'method', 'status')
+)
+HTTP_LATENCY = metrics.histogram(
+    'tradinggrow_http_request_duration_seconds', 'Time to build a response, per endpoint',
+    ('endpoint', 'method'), buckets=LATENCY_BUCKETS
+)
+HTTP_SQL_STATEMENTS = metrics.histogram(
+    'tradinggrow_http_sql_statements', 'SQL statements executed per request',
+    ('endpoint', 'method'), buckets=SQL_COUNT_BUCKETS
+)
+HTTP_SQL_DURATION = metrics.histogram(
+    'tradinggrow_http_sql_duration_seconds', 'Time spent in SQL per request',
+    ('endpoint', 'method'), buckets=LATENCY_BUCKETS
+)
+HTTP_RESPONSE_SIZE = metrics.histogram(
+    'tradinggrow_http_response_size_bytes', 'Response body size, for responses with a known length',
+    ('endpoint', 'method'), buckets=SIZE_BUCKETS
+)
+
+
+def _endpoint_label() -> str:
+    # Route names rather than paths, so ids in URLs do not explode label cardinality
+    return request.endpoint or 'unmatched'
+
+
+def _before_request():
+    # Workers fork after import, so each starts publishing its metrics on its first request
+    metrics.start()
+    g.profile_start = time.perf_counter()
+    g.profile_sql_count = 0
+    g.profile_sql_seconds = 0.0
+
+
+def _after_request(response):
+    start = g.get('profile_start')
+    if start is None:
+        return response
+
+    elapsed = time.perf_counter() - start
+    sql_count = g.profile_sql_count
+    sql_seconds = g.profile_sql_seconds
+    endpoint = _endpoint_label()
+    method = request.method
+
+    HTTP_REQUESTS.inc(endpoint=endpoint, method=method, status=response.status_code)
+    HTTP_LATENCY.observe(elapsed, endpoint=endpoint, method=method)
+    HTTP_SQL_STATEMENTS.observe(sql_count, endpoint=endpoint, method=method)
+    HTTP_SQL_DURATION.observe(sql_seconds, endpoint=endpoint, method=method)
+    if not response.is_streamed:
+        size = response.calculate_content_length()
+        if size is not None:
+            HTTP_RESPONSE_SIZE.observe(size, endpoint=endpoint, method=method)
+
+    if sql_count > REQUEST_SQL_WARN_COUNT:
+        logger.warning(f"{method} {request.path} ({endpoint}) ran {sql_count} SQL statements "
+                       f"in {sql_seconds * 1000:.1f}ms")
+
+    if request.headers.get(DEBUG_TIMING_HEADER) and _timing_header_allowed():
+        app_ms = (elapsed - sql_seconds) * 1000
+        response.headers.add('Server-Timing', f'app;dur={app_ms:.2f}')
+        response.headers.add('Server-Timing', f'db;dur={sql_seconds * 1000:.2f};desc="{sql_count} queries"')
+        response.headers.add('Server-Timing', f'total;dur={elapsed * 1000:.2f}')
+    return response
+
+
+def _timing_header_allowed() -> bool:
+    return REQUEST_TIMING_HEADER_ENABLED or current_app.debug
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('profile_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('profile_query_start')
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    # Statements from background threads (refreshers, import jobs) have no request to charge
+    if has_request_context() and 'profile_start' in g:
+        g.profile_sql_count += 1
+        g.profile_sql_seconds += elapsed
+
+
+def _handle_error(exception_context):
+    # Failed statements never reach after_cursor_execute; drop their start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get('profile_query_start'):
+        conn.info['profile_query_start'].pop()
+
+
+def init_request_profiling(app):
+    """Install the request hooks and the SQLAlchemy engine listeners"""
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+
+
+def slowest_endpoints(collected: Optional[Dict] = None, limit: int = 10):
+    """Endpoints ordered by p95 latency, with their average SQL statement count
+
+    Pass the result of metrics.collect() when the caller already has one, as
+    collecting re-reads every worker's metrics file.
+    """
+    if collected is None:
+        collected = metrics.collect()
+    statements = collected[HTTP_SQL_STATEMENTS.name].summary()
+    rows = []
+    for (endpoint, method), summary in collected[HTTP_LATENCY.name].summary().items():
+        sql = statements.get((endpoint, method), {})
+        rows.append({
+            'endpoint': endpoint,
+            'method': method,
+            'requests': summary['count'],
+            'p50_ms': round(summary['p50'] * 1000, 1),
+            'p95_ms': round(summary['p95'] * 1000, 1),
+            'p99_ms': round(summary['p99'] * 1000, 1),
+            'avg_sql_statements': round(sql.get('mean', 0.0), 1)
+        })
+    rows.sort(key=lambda row: row['p95_ms'], reverse=True)
+    return rows[:limit]
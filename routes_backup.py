@@ -18,6 +18,25 @@ def init_session():
         session['_id'] = str(uuid.uuid4())
     session.permanent = True
 
+def get_or_create_watchlists(user_id):
+    """Get a user's watchlists grouped by type, creating the defaults in one bulk insert if none exist"""
+    from models import Watchlist
+    
+    grouped = Watchlist.get_grouped_by_user(user_id)
+    if any(grouped.values()):
+        return grouped
+    
+    stocks_by_type = {}
+    for watchlist_type, defaults in MarketDataService.get_default_watchlist_data().items():
+        stocks_by_type[watchlist_type] = []
+        for stock in defaults:
+            stock_data = MarketDataService.get_stock_data(stock['symbol'])
+            if stock_data:
+                stock_data['buy_point'] = stock['buy_point']
+                stocks_by_type[watchlist_type].append(stock_data)
+    
+    return Watchlist.create_defaults(user_id, stocks_by_type)
+
 @app.route('/')
 def index():
     """Redirect to dashboard if logged in, otherwise to login"""
@@ -37,50 +56,11 @@ def dashboard():
     # Regular user dashboard with React components
     sector_data = MarketDataService.get_sector_data()
     
-    # Get user's watchlists
-    breakout_watchlists = Watchlist.get_by_user_and_type(current_user.id, 'breakout')
-    speculative_watchlists = Watchlist.get_by_user_and_type(current_user.id, 'speculative')
-    normal_watchlists = Watchlist.get_by_user_and_type(current_user.id, 'normal')
-    
-    # If user has no watchlists, create default ones
-    if not (breakout_watchlists or speculative_watchlists or normal_watchlists):
-        default_data = MarketDataService.get_default_watchlist_data()
-        
-        # Create default watchlists
-        breakout_wl = Watchlist('Breakout Watchlist', current_user.id, 'breakout')
-        speculative_wl = Watchlist('Speculative Watchlist', current_user.id, 'speculative')
-        normal_wl = Watchlist('Normal Watchlist', current_user.id, 'normal')
-        
-        # Add default stocks
-        for stock in default_data['breakout']:
-            stock_data = MarketDataService.get_stock_data(stock['symbol'])
-            if stock_data:
-                stock_data['buy_point'] = stock['buy_point']
-                breakout_wl.add_stock(stock_data)
-        
-        for stock in default_data['speculative']:
-            stock_data = MarketDataService.get_stock_data(stock['symbol'])
-            if stock_data:
-                stock_data['buy_point'] = stock['buy_point']
-                speculative_wl.add_stock(stock_data)
-        
-        for stock in default_data['normal']:
-            stock_data = MarketDataService.get_stock_data(stock['symbol'])
-            if stock_data:
-                stock_data['buy_point'] = stock['buy_point']
-                normal_wl.add_stock(stock_data)
-        
-        # Save watchlists
-        breakout_wl.save()
-        speculative_wl.save()
-        normal_wl.save()
-        
-        breakout_watchlists = [breakout_wl]
-        speculative_watchlists = [speculative_wl]
-        normal_watchlists = [normal_wl]
+    # Get user's watchlists in one query, creating the defaults on first visit
+    grouped = get_or_create_watchlists(current_user.id)
     
     # Convert watchlists to dictionaries for JSON serialization
-    all_watchlists = breakout_watchlists + speculative_watchlists + normal_watchlists
+    all_watchlists = grouped['breakout'] + grouped['speculative'] + grouped['normal']
     watchlists_data = []
     for watchlist in all_watchlists:
         watchlists_data.append({
@@ -111,52 +91,13 @@ def dashboard():
 @login_required
 def watchlist():
     """Watchlist management page"""
-    # Get user's watchlists
-    breakout_watchlists = Watchlist.get_by_user_and_type(current_user.id, 'breakout')
-    speculative_watchlists = Watchlist.get_by_user_and_type(current_user.id, 'speculative')
-    normal_watchlists = Watchlist.get_by_user_and_type(current_user.id, 'normal')
-    
-    # If user has no watchlists, create default ones
-    if not (breakout_watchlists or speculative_watchlists or normal_watchlists):
-        default_data = MarketDataService.get_default_watchlist_data()
-        
-        # Create default watchlists
-        breakout_wl = Watchlist('Breakout Watchlist', current_user.id, 'breakout')
-        speculative_wl = Watchlist('Speculative Watchlist', current_user.id, 'speculative')
-        normal_wl = Watchlist('Normal Watchlist', current_user.id, 'normal')
-        
-        # Add default stocks
-        for stock in default_data['breakout']:
-            stock_data = MarketDataService.get_stock_data(stock['symbol'])
-            if stock_data:
-                stock_data['buy_point'] = stock['buy_point']
-                breakout_wl.add_stock(stock_data)
-        
-        for stock in default_data['speculative']:
-            stock_data = MarketDataService.get_stock_data(stock['symbol'])
-            if stock_data:
-                stock_data['buy_point'] = stock['buy_point']
-                speculative_wl.add_stock(stock_data)
-        
-        for stock in default_data['normal']:
-            stock_data = MarketDataService.get_stock_data(stock['symbol'])
-            if stock_data:
-                stock_data['buy_point'] = stock['buy_point']
-                normal_wl.add_stock(stock_data)
-        
-        # Save watchlists
-        breakout_wl.save()
-        speculative_wl.save()
-        normal_wl.save()
-        
-        breakout_watchlists = [breakout_wl]
-        speculative_watchlists = [speculative_wl]
-        normal_watchlists = [normal_wl]
+    # Get user's watchlists in one query, creating the defaults on first visit
+    grouped = get_or_create_watchlists(current_user.id)
     
     return render_template('watchlist.html', 
-                         breakout_watchlists=breakout_watchlists,
-                         speculative_watchlists=speculative_watchlists,
-                         normal_watchlists=normal_watchlists)
+                         breakout_watchlists=grouped['breakout'],
+                         speculative_watchlists=grouped['speculative'],
+                         normal_watchlists=grouped['normal'])
 
 @app.route('/invitation')
 @login_required
@@ -439,9 +380,8 @@ def add_stock_to_user_watchlist(watchlist_id):
         return jsonify({'error': f'Could not find data for {symbol}'}), 400
     
     # Check if stock already exists
-    for stock in watchlist.stocks:
-        if stock.get('symbol') == symbol.upper():
-            return jsonify({'error': f'{symbol} already exists in this watchlist'}), 400
+    if watchlist.has_stock(symbol.upper()):
+        return jsonify({'error': f'{symbol} already exists in this watchlist'}), 400
     
     # Add stock
     watchlist.add_stock(stock_data)
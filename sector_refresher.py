@@ -0,0 +1,94 @@
+"""
+Background Sector Refresher for TradingGrow
+Recomputes sector performance on a schedule and publishes immutable snapshots
+"""
+
+import os
+import copy
+import json
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+from background import PerProcessThread
+from financial_data_service import FinancialDataService, financial_service
+
+logger = logging.getLogger(__name__)
+
+# Refresh cadence in seconds while the market is open / closed
+SECTOR_REFRESH_OPEN_SECONDS = float(os.getenv('SECTOR_REFRESH_OPEN_SECONDS', 60))
+SECTOR_REFRESH_CLOSED_SECONDS = float(os.getenv('SECTOR_REFRESH_CLOSED_SECONDS', 900))
+
+
+@dataclass(frozen=True)
+class SectorSnapshot:
+    """Published sector performance; readers must not mutate data"""
+    data: Dict
+    version: int
+    refreshed_at: datetime
+    # Content version: identical across workers that see the same data
+    digest: str
+
+
+def sector_digest(data: Dict) -> str:
+    """Hash of a sector payload, ignoring its fetch timestamp"""
+    content = {key: value for key, value in data.items() if key != 'last_updated'}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class SectorPerformanceRefresher(PerProcessThread):
+    """Keeps the latest sector performance off the request path"""
+
+    thread_name = 'sector-refresher'
+
+    def __init__(self, service: FinancialDataService,
+                 open_interval: float = SECTOR_REFRESH_OPEN_SECONDS,
+                 closed_interval: float = SECTOR_REFRESH_CLOSED_SECONDS):
+        super().__init__()
+        self.service = service
+        self.open_interval = open_interval
+        self.closed_interval = closed_interval
+        self._snapshot: Optional[SectorSnapshot] = None
+        self._refresh_lock = threading.Lock()
+
+    def snapshot(self) -> SectorSnapshot:
+        """Return the latest published snapshot, refreshing synchronously only on first use"""
+        self.start()
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.refresh(only_if_empty=True)
+            snapshot = self._snapshot
+        return snapshot
+
+    def refresh(self, only_if_empty: bool = False):
+        """Recompute sector performance and publish it if it changed"""
+        with self._refresh_lock:
+            current = self._snapshot
+            if only_if_empty and current is not None:
+                return
+            data = copy.deepcopy(self.service.get_sector_performance())
+            digest = sector_digest(data)
+            if current is not None and current.digest == digest:
+                return
+            version = current.version + 1 if current is not None else 1
+            self._snapshot = SectorSnapshot(data=data, version=version, refreshed_at=datetime.utcnow(), digest=digest)
+
+    def interval(self) -> float:
+        """Refresh quickly while the market is open and slowly while it is closed"""
+        if self.service._get_market_status() == 'open':
+            return self.open_interval
+        return self.closed_interval
+
+    def _run(self):
+        while not self._stop.wait(self.interval() if self._snapshot is not None else 0):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing sector performance: {e}")
+
+
+# Global instance
+sector_refresher = SectorPerformanceRefresher(financial_service)
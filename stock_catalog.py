@@ -0,0 +1,241 @@
+"""
+Stock Catalog for TradingGrow
+In-process read-through cache over the stocks table, shared by the admin and user stock endpoints
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from industry_index import IndustryIndex
+
+logger = logging.getLogger(__name__)
+
+# How long a worker trusts its cached catalog before re-checking the table's version
+STOCK_CATALOG_REVALIDATE_SECONDS = float(os.getenv('STOCK_CATALOG_REVALIDATE_SECONDS', 1))
+
+# Initial catalog for a fresh database
+SEED_STOCKS = [
+    {
+        'symbol': 'AAPL',
+        'name': 'Apple Inc.',
+        'sector': 'Technology',
+        'industry_type': 'Consumer Electronics',
+        'industry_code': 'TECH001',
+        'price': 175.50,
+        'change_percent': 2.3
+    },
+    {
+        'symbol': 'GOOGL',
+        'name': 'Alphabet Inc.',
+        'sector': 'Technology',
+        'industry_type': 'Internet Services',
+        'industry_code': 'TECH002',
+        'price': 2850.25,
+        'change_percent': -1.2
+    },
+    {
+        'symbol': 'MSFT',
+        'name': 'Microsoft Corporation',
+        'sector': 'Technology',
+        'industry_type': 'Software',
+        'industry_code': 'TECH003',
+        'price': 420.15,
+        'change_percent': 1.8
+    },
+    {
+        'symbol': 'TSLA',
+        'name': 'Tesla Inc.',
+        'sector': 'Consumer',
+        'industry_type': 'Electric Vehicles',
+        'industry_code': 'AUTO001',
+        'price': 245.80,
+        'change_percent': -3.5
+    },
+    {
+        'symbol': 'HD',
+        'name': 'Home Depot Inc.',
+        'sector': 'Wholesale Distributors',
+        'industry_type': 'Home Improvement',
+        'industry_code': 'RETAIL001',
+        'price': 320.45,
+        'change_percent': 1.5
+    },
+    {
+        'symbol': 'LOW',
+        'name': 'Lowe\'s Companies',
+        'sector': 'Wholesale Distributors',
+        'industry_type': 'Home Improvement',
+        'industry_code': 'RETAIL002',
+        'price': 225.80,
+        'change_percent': 0.8
+    },
+    {
+        'symbol': 'JPM',
+        'name': 'JPMorgan Chase',
+        'sector': 'Financials',
+        'industry_type': 'Banking',
+        'industry_code': 'FIN001',
+        'price': 145.30,
+        'change_percent': -0.5
+    },
+    {
+        'symbol': 'BAC',
+        'name': 'Bank of America',
+        'sector': 'Financials',
+        'industry_type': 'Banking',
+        'industry_code': 'FIN002',
+        'price': 35.75,
+        'change_percent': 1.2
+    }
+]
+
+
+class StockCatalog:
+    """Cached copy of the stocks table with O(1) symbol and id lookups
+
+    Writes in this worker are applied to the cache directly through upsert()
+    and remove(). Other workers pick them up on their next read after the
+    revalidation interval: a revalidation is a single count/max(updated_at)
+    query, and when that version moved only rows updated since the last sync
+    are fetched. Deletes show up as a row count below the cached one and are
+    resolved with an id-only query.
+    """
+
+    def __init__(self, revalidate_seconds: float = STOCK_CATALOG_REVALIDATE_SECONDS):
+        self.revalidate_seconds = revalidate_seconds
+        self.index = IndustryIndex()
+        self._stocks: Optional[List[Dict]] = []
+        self._by_symbol: Dict[str, Dict] = {}
+        self._by_id: Dict[str, Dict] = {}
+        self._version = None
+        self._synced_at = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def version(self):
+        """Current catalog version, for conditional GETs"""
+        self._ensure_fresh()
+        return self._version
+
+    def all(self) -> List[Dict]:
+        """Every stock in id order; callers must not mutate the dicts"""
+        self._ensure_fresh()
+        with self._lock:
+            if self._stocks is None:
+                self._stocks = sorted(self._by_id.values(), key=lambda stock: int(stock['id']))
+            return self._stocks
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        self._ensure_fresh()
+        return self._by_symbol.get(symbol.upper())
+
+    def get_by_id(self, stock_id: str) -> Optional[Dict]:
+        self._ensure_fresh()
+        return self._by_id.get(str(stock_id))
+
+    def upsert(self, stock: Dict):
+        """Apply a committed insert or update from this worker (stock in to_dict() shape)"""
+        with self._lock:
+            self._apply(stock)
+            self._checked_at = 0.0
+
+    def remove(self, stock_id: str):
+        """Apply a committed delete from this worker"""
+        with self._lock:
+            self._discard(str(stock_id))
+            self._checked_at = 0.0
+
+    def invalidate(self):
+        """Force the next read to re-check the table (call after committing a bulk write)"""
+        with self._lock:
+            self._checked_at = 0.0
+
+    def _ensure_fresh(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._version is not None and now - self._checked_at < self.revalidate_seconds:
+                return
+
+            from models import Stock
+            version = Stock.get_catalog_version()
+            if version != self._version:
+                if self._version is None:
+                    self._reload(Stock)
+                else:
+                    self._sync(Stock, version[0])
+                self._version = version
+            self._checked_at = now
+
+    def _reload(self, Stock):
+        rows = Stock.query.order_by(Stock.id).all()
+        stocks = [row.to_dict() for row in rows]
+        self._stocks = stocks
+        self._by_symbol = {stock['symbol']: stock for stock in stocks}
+        self._by_id = {stock['id']: stock for stock in stocks}
+        self.index.rebuild(stocks)
+        self._synced_at = max((row.updated_at for row in rows if row.updated_at is not None), default=None)
+        logger.debug(f"Loaded stock catalog ({len(stocks)} stocks)")
+
+    def _sync(self, Stock, count: int):
+        query = Stock.query
+        if self._synced_at is not None:
+            # >= rather than >: rows sharing the last timestamp may have committed after the last sync
+            query = query.filter(Stock.updated_at >= self._synced_at)
+        changed = query.all()
+        for row in changed:
+            self._apply(row.to_dict())
+            if row.updated_at is not None and (self._synced_at is None or row.updated_at > self._synced_at):
+                self._synced_at = row.updated_at
+
+        removed = 0
+        if len(self._by_id) > count:
+            live = {str(stock_id) for (stock_id,) in Stock.query.with_entities(Stock.id)}
+            for stock_id in [stock_id for stock_id in self._by_id if stock_id not in live]:
+                self._discard(stock_id)
+                removed += 1
+        logger.debug(f"Synced stock catalog ({len(changed)} changed, {removed} removed)")
+
+    def _apply(self, stock: Dict):
+        previous = self._by_id.get(stock['id'])
+        if previous is not None and self._by_symbol.get(previous['symbol']) is previous:
+            del self._by_symbol[previous['symbol']]
+        self._by_id[stock['id']] = stock
+        self._by_symbol[stock['symbol']] = stock
+        self.index.upsert(stock)
+        self._stocks = None
+
+    def _discard(self, stock_id: str):
+        previous = self._by_id.pop(stock_id, None)
+        if previous is None:
+            return
+        if self._by_symbol.get(previous['symbol']) is previous:
+            del self._by_symbol[previous['symbol']]
+        self.index.remove(stock_id)
+        self._stocks = None
+
+
+def seed_stock_catalog(db, stocks: List[Dict] = SEED_STOCKS):
+    """Populate an empty stocks table from seed data"""
+    from models import Stock
+
+    if Stock.query.first() is not None:
+        return
+
+    for stock in stocks:
+        db.session.add(Stock(
+            stock['symbol'], stock['name'],
+            sector=stock.get('sector'),
+            industry_type=stock.get('industry_type'),
+            industry_code=stock.get('industry_code'),
+            price=stock.get('price', 0.0),
+            change_percent=stock.get('change_percent', 0.0)
+        ))
+    db.session.commit()
+    logger.info(f"Seeded stock catalog with {len(stocks)} stocks")
+
+
+# Global instance
+stock_catalog = StockCatalog()
@@ -0,0 +1,168 @@
+"""
+Stock CSV Import for TradingGrow
+Streams rows from an uploaded CSV and upserts them into the stocks table in batches
+"""
+
+import io
+import os
+import csv
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, IO, Iterator, List, Optional
+
+from sqlalchemy import insert, update
+
+logger = logging.getLogger(__name__)
+
+# Rows validated and written per statement/commit
+STOCK_IMPORT_BATCH_SIZE = int(os.getenv('STOCK_IMPORT_BATCH_SIZE', 2000))
+# Error messages kept per import; the rest are only counted
+STOCK_IMPORT_MAX_ERRORS = int(os.getenv('STOCK_IMPORT_MAX_ERRORS', 100))
+
+REQUIRED_FIELDS = ('symbol', 'name', 'sector', 'price')
+UPSERT_FIELDS = ('name', 'sector', 'industry_type', 'industry_code', 'price', 'change_percent', 'updated_at')
+
+
+@dataclass
+class ImportResult:
+    """Running totals for one import"""
+    rows_read: int = 0
+    processed: int = 0
+    error_count: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def add_error(self, message: str, max_errors: int = STOCK_IMPORT_MAX_ERRORS):
+        self.error_count += 1
+        if len(self.errors) < max_errors:
+            self.errors.append(message)
+
+
+@contextmanager
+def open_csv(stream: IO[bytes]) -> Iterator[csv.DictReader]:
+    """Read CSV rows straight from a binary upload stream without loading it into memory
+
+    The text wrapper is detached on exit, so the caller's stream stays open
+    (and tell() keeps working) once the rows have been read.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        yield csv.DictReader(text)
+    finally:
+        text.detach()
+
+
+def parse_row(row: Dict, row_num: int, max_lengths: Dict[str, int]) -> Dict:
+    """Validate one CSV row and convert it to stocks table values (raises ValueError)"""
+    missing_fields = [name for name in REQUIRED_FIELDS if not (row.get(name) or '').strip()]
+    if missing_fields:
+        raise ValueError(f"Row {row_num}: Missing required fields: {', '.join(missing_fields)}")
+
+    try:
+        stock = {
+            'symbol': row['symbol'].strip().upper(),
+            'name': row['name'].strip(),
+            'sector': row['sector'].strip(),
+            'industry_type': (row.get('industry_type') or '').strip(),
+            'industry_code': (row.get('industry_code') or '').strip(),
+            'price': float(row['price']),
+            'change_percent': float(row.get('change_percent') or 0)
+        }
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Row {row_num}: Invalid data format - {str(e)}")
+
+    # One oversized value would otherwise fail the whole batch on strict databases
+    for name, limit in max_lengths.items():
+        if len(stock.get(name) or '') > limit:
+            raise ValueError(f"Row {row_num}: {name} is longer than {limit} characters")
+
+    return stock
+
+
+def upsert_stocks(db, stocks: List[Dict]):
+    """Insert or update a batch of stocks keyed on symbol, without committing"""
+    from models import Stock
+
+    if not stocks:
+        return
+
+    table = Stock.__table__
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.symbol],
+            set_={name: stmt.excluded[name] for name in UPSERT_FIELDS}
+        )
+        db.session.execute(stmt, stocks)
+        return
+
+    # Other databases: resolve existing symbols with one IN query, then bulk insert/update
+    existing = dict(db.session.query(Stock.symbol, Stock.id).filter(
+        Stock.symbol.in_([stock['symbol'] for stock in stocks])
+    ).all())
+    new_stocks = [stock for stock in stocks if stock['symbol'] not in existing]
+    changed = [
+        dict({name: value for name, value in stock.items() if name != 'created_at'}, id=existing[stock['symbol']])
+        for stock in stocks if stock['symbol'] in existing
+    ]
+    if new_stocks:
+        db.session.execute(insert(table), new_stocks)
+    if changed:
+        db.session.execute(update(Stock), changed)
+
+
+def import_stocks_csv(db, stream: IO[bytes], batch_size: int = STOCK_IMPORT_BATCH_SIZE,
+                      on_progress: Optional[Callable[[ImportResult], None]] = None) -> ImportResult:
+    """Stream a stocks CSV into the catalog, committing one batch at a time
+
+    Memory stays bounded by the batch size. Within a batch, a later row for
+    the same symbol replaces an earlier one, as it would across batches.
+    """
+    from models import Stock
+
+    max_lengths = {
+        name: column.type.length for name, column in Stock.__table__.c.items()
+        if name in ('symbol', 'name', 'sector', 'industry_type', 'industry_code') and column.type.length
+    }
+    result = ImportResult()
+    batch: Dict[str, Dict] = {}
+
+    def flush():
+        now = datetime.utcnow()
+        upsert_stocks(db, [dict(stock, created_at=now, updated_at=now) for stock in batch.values()])
+        db.session.commit()
+        batch.clear()
+        logger.info(f"Stock import: {result.rows_read} rows read, {result.processed} processed, "
+                    f"{result.error_count} errors")
+        if on_progress:
+            on_progress(result)
+
+    try:
+        with open_csv(stream) as reader:
+            for row_num, row in enumerate(reader, start=2):  # Start from 2 to account for header
+                result.rows_read += 1
+                try:
+                    stock = parse_row(row, row_num, max_lengths)
+                except ValueError as e:
+                    result.add_error(str(e))
+                    continue
+
+                batch[stock['symbol']] = stock
+                result.processed += 1
+                if len(batch) >= batch_size:
+                    flush()
+
+        if batch:
+            flush()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return result
@@ -0,0 +1,35 @@
+"""
+Test fixtures for TradingGrow
+Runs the app against a throwaway SQLite database
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+# The app configures its database at import time, so point it at a scratch file first
+_db_dir = tempfile.mkdtemp(prefix='tradinggrow-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app as flask_app, db  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    with flask_app.app_context():
+        yield flask_app
+        db.session.remove()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+
+
+@pytest.fixture
+def admin_client(app):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['mock_user_data'] = {'id': 'admin', 'email': 'admin@example.com', 'is_admin': True}
+    return client
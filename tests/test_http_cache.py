@@ -0,0 +1,37 @@
+from financial_data_service import financial_service
+from sector_refresher import sector_refresher
+
+
+def logged_in_client(app):
+    from models import User
+
+    user = User(email='etag@example.com').save()
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = user.id
+        session['_fresh'] = True
+    return client
+
+
+def test_auth_me_etag_survives_a_refetch_of_unchanged_data(app):
+    client = logged_in_client(app)
+    first = client.get('/api/auth/me')
+    assert first.status_code == 200 and first.headers.get('ETag')
+
+    # Expire every cached quote and re-run the sector refresh, as later polls would
+    financial_service.cache.clear()
+    sector_refresher.refresh()
+    again = client.get('/api/auth/me', headers={'If-None-Match': first.headers['ETag']})
+
+    assert again.status_code == 304
+
+
+def test_user_data_etag_is_stable(app):
+    client = logged_in_client(app)
+    first = client.get('/api/user/data')
+    assert first.status_code == 200
+
+    financial_service.cache.clear()
+    again = client.get('/api/user/data', headers={'If-None-Match': first.headers['ETag']})
+
+    assert again.status_code == 304
@@ -0,0 +1,109 @@
+import io
+from datetime import datetime, timedelta
+
+from werkzeug.datastructures import FileStorage
+
+from app import db
+from import_jobs import ImportJobRunner
+
+
+def run_import(app, data, batch_size=2):
+    """Submit a CSV through the job runner and wait for it to finish"""
+    from models import ImportJob
+
+    runner = ImportJobRunner(workers=1, batch_size=batch_size)
+    job = runner.submit_stock_csv(app, FileStorage(stream=io.BytesIO(data), filename='stocks.csv'))
+    runner._pool().shutdown(wait=True)
+    runner.stop()
+    db.session.expire_all()
+    return ImportJob.get(job.id)
+
+
+def test_import_job_completes_with_a_partial_final_batch(app):
+    from models import Stock
+
+    rows = ['symbol,name,sector,price,change_percent']
+    rows += [f'SYM{i},Company {i},Technology,{10 + i},0.5' for i in range(5)]
+    rows.append('BAD,Missing price,Technology,,')
+
+    job = run_import(app, ('\n'.join(rows) + '\n').encode())
+
+    assert job.status == 'completed', job.message
+    assert (job.rows_read, job.processed, job.error_count) == (6, 5, 1)
+    assert job.bytes_read == job.bytes_total
+    assert Stock.query.filter(Stock.symbol.like('SYM%')).count() == 5
+
+
+def test_import_job_completes_when_rows_fill_whole_batches(app):
+    job = run_import(app, b'symbol,name,sector,price\nAAA,Alpha,Energy,12.5\nBBB,Beta,Energy,7\n')
+
+    assert job.status == 'completed', job.message
+    assert (job.rows_read, job.processed, job.error_count) == (2, 2, 0)
+
+
+def test_import_job_with_invalid_encoding_fails(app):
+    job = run_import(app, b'symbol,name,sector,price\n\xff\xfe,x,y,1\n')
+
+    assert job.status == 'failed'
+
+
+def test_import_job_error_listing_is_clamped(app, admin_client):
+    rows = ['symbol,name,sector,price'] + [f'BAD{i},Name,Tech,notaprice' for i in range(3)]
+    job = run_import(app, ('\n'.join(rows) + '\n').encode())
+
+    def errors(limit):
+        response = admin_client.get(f'/admin/api/import-jobs/{job.id}?errors={limit}')
+        assert response.status_code == 200
+        return response.get_json()['job']['error_details']
+
+    assert errors(-5) == []
+    assert len(errors(2)) == 2
+    assert len(errors(1000)) == 3
+
+
+def test_polling_fails_a_job_whose_worker_stopped_heartbeating(app, admin_client):
+    from models import ImportJob
+
+    lost, alive = ImportJob(filename='lost.csv'), ImportJob(filename='alive.csv')
+    lost.status = alive.status = 'running'
+    lost.heartbeat_at = datetime.utcnow() - timedelta(hours=1)
+    db.session.add_all([lost, alive])
+    db.session.commit()
+
+    lost_job = admin_client.get(f'/admin/api/import-jobs/{lost.id}').get_json()['job']
+    alive_job = admin_client.get(f'/admin/api/import-jobs/{alive.id}').get_json()['job']
+
+    assert lost_job['status'] == 'failed' and 'interrupted' in lost_job['message']
+    assert lost_job['finished_at'] is not None
+    assert alive_job['status'] == 'running'
+
+
+def test_runner_heartbeats_the_jobs_it_holds(app):
+    from models import ImportJob
+
+    held = ImportJob(filename='held.csv')
+    other = ImportJob(filename='other.csv')
+    for job in (held, other):
+        job.heartbeat_at = datetime.utcnow() - timedelta(hours=1)
+    db.session.add_all([held, other])
+    db.session.commit()
+
+    runner = ImportJobRunner()
+    runner._app = app
+    runner._held.add(held.id)
+    runner.heartbeat()
+
+    db.session.expire_all()
+    assert datetime.utcnow() - ImportJob.get(held.id).heartbeat_at < timedelta(minutes=1)
+    assert datetime.utcnow() - ImportJob.get(other.id).heartbeat_at > timedelta(minutes=59)
+
+
+def test_migration_adds_the_heartbeat_column_to_an_existing_table(app):
+    from sqlalchemy import inspect, text
+    from migrations import ensure_columns
+
+    with db.engine.begin() as conn:
+        conn.execute(text('ALTER TABLE import_jobs DROP COLUMN heartbeat_at'))
+    ensure_columns(db)
+
+    assert 'heartbeat_at' in {column['name'] for column in inspect(db.engine).get_columns('import_jobs')}
@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+from live_updates import LiveUpdateHub
+
+
+def sector(name, performance):
+    return {'name': name, 'display_name': name.title(), 'performance': performance}
+
+
+class FakeRefresher:
+    def __init__(self, *sectors):
+        self.publish(*sectors)
+
+    def publish(self, *sectors):
+        version = getattr(self, '_snapshot', SimpleNamespace(version=0)).version + 1
+        self._snapshot = SimpleNamespace(version=version, data={'sectors': list(sectors), 'source': 'test'})
+
+    def snapshot(self):
+        return self._snapshot
+
+
+class FakeService:
+    def get_multiple_stocks(self, symbols):
+        return {}
+
+
+def drain(subscription):
+    events = []
+    while (event := subscription.next_event(timeout=0)) is not None:
+        events.append(event)
+    return events
+
+
+def test_sector_updates_send_only_the_changed_sectors():
+    refresher = FakeRefresher(sector('energy', 1.0), sector('technology', 2.0), sector('utilities', 0.5))
+    hub = LiveUpdateHub(FakeService(), refresher, interval=3600)
+    try:
+        subscription = hub.subscribe([])
+        (name, initial), = drain(subscription)
+        assert name == 'sectors' and len(initial['sectorData']['sectors']) == 3
+
+        refresher.publish(sector('energy', 1.0), sector('technology', 2.5), sector('materials', -1.0))
+        hub.publish_once()
+        (name, delta), = drain(subscription)
+
+        assert name == 'sector-changes'
+        assert delta['version'] == 2
+        assert delta['changed'] == {'technology': sector('technology', 2.5), 'materials': sector('materials', -1.0)}
+        assert delta['order'] == ['energy', 'technology', 'materials']
+        assert delta['meta'] == {'source': 'test'}
+
+        # Nothing is resent while the version stands still
+        hub.publish_once()
+        assert drain(subscription) == []
+    finally:
+        hub.stop()
+
+
+def test_each_subscriber_gets_a_delta_from_what_it_last_saw():
+    refresher = FakeRefresher(sector('energy', 1.0), sector('technology', 2.0))
+    hub = LiveUpdateHub(FakeService(), refresher, interval=3600)
+    try:
+        early = hub.subscribe([])
+        refresher.publish(sector('energy', 1.5), sector('technology', 2.0))
+        late = hub.subscribe([])
+        drain(early), drain(late)
+
+        refresher.publish(sector('energy', 1.5), sector('technology', 3.0))
+        hub.publish_once()
+
+        (_, early_delta), = drain(early)
+        (_, late_delta), = drain(late)
+        assert set(early_delta['changed']) == {'energy', 'technology'}
+        assert set(late_delta['changed']) == {'technology'}
+    finally:
+        hub.stop()
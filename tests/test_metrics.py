@@ -0,0 +1,60 @@
+import metrics as metrics_module
+from metrics import MetricsRegistry
+
+
+def worker_registry(multiproc_dir):
+    registry = MetricsRegistry(multiproc_dir=str(multiproc_dir))
+    requests = registry.counter('requests_total', 'Requests', ('status',))
+    latency = registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1.0))
+    return registry, requests, latency
+
+
+def test_render_sums_every_workers_metrics(tmp_path, monkeypatch):
+    first, first_requests, first_latency = worker_registry(tmp_path)
+    second, second_requests, second_latency = worker_registry(tmp_path)
+
+    first_requests.inc(status='200')
+    first_requests.inc(status='200')
+    first_latency.observe(0.05)
+    monkeypatch.setattr(metrics_module.os, 'getpid', lambda: 1001)
+    first.flush()
+
+    second_requests.inc(status='200')
+    second_requests.inc(status='500')
+    second_latency.observe(0.5)
+    monkeypatch.setattr(metrics_module.os, 'getpid', lambda: 1002)
+    second.flush()
+    # Whichever worker serves the scrape reports the same totals
+    for pid, registry in ((1001, first), (1002, second)):
+        monkeypatch.setattr(metrics_module.os, 'getpid', lambda: pid)
+        body = registry.render()
+        assert 'requests_total{status="200"} 3' in body
+        assert 'requests_total{status="500"} 1' in body
+        assert 'latency_seconds_bucket{le="0.1"} 1' in body
+        assert 'latency_seconds_bucket{le="1"} 2' in body
+        assert 'latency_seconds_count 2' in body
+
+    assert second.collect()['latency_seconds'].summary()[()]['count'] == 2
+    # Scrapes read the shared files without adding to a worker's own counts
+    assert second_requests.value(status='200') == 1
+
+
+def test_without_a_directory_only_this_process_is_reported(tmp_path):
+    registry, requests, _ = worker_registry('')
+    requests.inc(status='200')
+
+    assert registry.collect()['requests_total'] is requests
+    assert 'requests_total{status="200"} 1' in registry.render()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_detailed_health_collects_worker_metrics_once(app, monkeypatch):
+    from metrics import metrics
+
+    calls = []
+    collect = metrics.collect
+    monkeypatch.setattr(metrics, 'collect', lambda: (calls.append(1), collect())[1])
+
+    app.test_client().get('/health/detailed')
+
+    assert calls == [1]
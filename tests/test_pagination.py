@@ -0,0 +1,67 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from pagination import decode_cursor, encode_cursor
+
+
+def cursor_for(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+@pytest.fixture
+def user_columns(app):
+    from models import User
+    return (User.created_at, User.id)
+
+
+def test_cursor_round_trips(user_columns):
+    created_at = datetime(2026, 1, 2, 3, 4, 5)
+    assert decode_cursor(encode_cursor([created_at, 'abc']), user_columns) == [created_at, 'abc']
+
+
+@pytest.mark.parametrize('token', [
+    'not base64!',
+    cursor_for({'created_at': 1}),
+    cursor_for(['2026-01-01T00:00:00']),
+    cursor_for([1, 2]),
+    cursor_for(['2026-01-01T00:00:00', 2]),
+    cursor_for(['yesterday', 'abc']),
+    cursor_for([None, 'abc']),
+    cursor_for([['2026-01-01'], 'abc']),
+])
+def test_malformed_cursors_are_rejected(user_columns, token):
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode_cursor(token, user_columns)
+
+
+@pytest.mark.parametrize('values', [[1, 2], ['2026-01-01T00:00:00', 2], [None, 'x'], ['soon', 'x']])
+def test_admin_user_listing_returns_400_for_malformed_cursors(admin_client, values):
+    response = admin_client.get(f'/admin/api/users?cursor={cursor_for(values)}')
+    assert response.status_code == 400
+
+
+def test_admin_user_listing_pages_without_duplicates(app, admin_client):
+    from models import User
+
+    base = datetime(2026, 1, 1)
+    for i in range(7):
+        user = User(email=f'user{i}@example.com')
+        user.created_at = base + timedelta(minutes=i // 2)  # ties on created_at
+        db.session.add(user)
+    db.session.commit()
+
+    seen, cursor = [], None
+    while True:
+        response = admin_client.get('/admin/api/users?limit=3' + (f'&cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        data = response.get_json()
+        seen += [user['id'] for user in data['users']]
+        cursor = data['next_cursor']
+        if not cursor:
+            break
+
+    assert len(seen) == len(set(seen)) == 7
@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from quote_cache import LRUCacheBackend, QuoteCache
+
+
+def call_concurrently(count, call):
+    results, errors = [], []
+    barrier = threading.Barrier(count)
+
+    def worker():
+        barrier.wait()
+        try:
+            results.append(call())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def failing_loader(calls):
+    def loader(*args):
+        calls.append(1)
+        time.sleep(0.2)
+        raise ConnectionError('upstream down')
+    return loader
+
+
+def test_waiters_do_not_refetch_after_the_leader_fails():
+    cache = QuoteCache(LRUCacheBackend())
+    calls = []
+
+    results, errors = call_concurrently(20, lambda: cache.get_or_load('stock_data', 'AAPL', failing_loader(calls)))
+
+    assert len(calls) == 1
+    assert results == [] and len(errors) == 20
+    assert all(isinstance(error, ConnectionError) for error in errors)
+
+
+def test_waiters_get_the_fallback_when_the_leader_fails():
+    cache = QuoteCache(LRUCacheBackend())
+    calls = []
+
+    results, errors = call_concurrently(20, lambda: cache.get_or_load(
+        'stock_data', 'AAPL', failing_loader(calls), fallback=lambda: {'source': 'fallback'}))
+
+    assert len(calls) == 1
+    assert len(errors) == 1 and results == [{'source': 'fallback'}] * 19
+
+
+def test_waiters_give_up_on_a_slow_leader_without_fetching():
+    cache = QuoteCache(LRUCacheBackend(), lock_timeout=0.05)
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        time.sleep(0.3)
+        return {'source': 'upstream'}
+
+    results, errors = call_concurrently(10, lambda: cache.get_or_load('stock_data', 'AAPL', slow_loader))
+
+    assert len(calls) == 1
+    assert results == [{'source': 'upstream'}]
+    assert len(errors) == 9 and all(isinstance(error, TimeoutError) for error in errors)
+
+
+def test_batch_waiters_fall_back_instead_of_refetching():
+    cache = QuoteCache(LRUCacheBackend())
+    calls = []
+
+    def lookup():
+        return cache.get_many('multiple_stocks', ['AAPL', 'MSFT'], failing_loader(calls),
+                              fallback=lambda missing: {symbol: 'fallback' for symbol in missing})
+
+    results, errors = call_concurrently(10, lookup)
+
+    assert len(calls) == 1
+    assert len(errors) == 1
+    assert results == [{'AAPL': 'fallback', 'MSFT': 'fallback'}] * 9
+
+
+def test_leader_errors_still_reach_the_leader():
+    cache = QuoteCache(LRUCacheBackend())
+
+    with pytest.raises(ConnectionError):
+        cache.get_or_load('stock_data', 'AAPL', failing_loader([]), fallback=lambda: 'unused')
@@ -0,0 +1,27 @@
+from financial_data_service import FinancialDataService
+from quote_cache import LRUCacheBackend, QuoteCache
+from sector_refresher import SectorPerformanceRefresher
+
+
+def uncached_service():
+    # A zero TTL makes every refresh fetch again, as happens once the cache entry expires
+    return FinancialDataService(cache=QuoteCache(LRUCacheBackend(), ttls={'sector_performance': 0}))
+
+
+def test_refresh_keeps_the_version_while_sector_data_is_unchanged():
+    refresher = SectorPerformanceRefresher(uncached_service())
+    refresher.refresh()
+    first = refresher._snapshot
+    refresher.refresh()
+    refresher.refresh()
+
+    assert refresher._snapshot is first
+    assert first.version == 1
+
+
+def test_digest_matches_across_workers():
+    first, second = SectorPerformanceRefresher(uncached_service()), SectorPerformanceRefresher(uncached_service())
+    first.refresh()
+    second.refresh()
+
+    assert first._snapshot.digest == second._snapshot.digest
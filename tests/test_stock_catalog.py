@@ -0,0 +1,62 @@
+import json
+
+from app import db
+from stock_catalog import StockCatalog, stock_catalog
+
+
+def add_stocks(*symbols, sector='Technology'):
+    from models import Stock
+
+    stocks = [Stock(symbol, f'{symbol} Inc.', sector=sector, industry_type='Software', price=10.0)
+              for symbol in symbols]
+    db.session.add_all(stocks)
+    db.session.commit()
+    return stocks
+
+
+def count_rebuilds(catalog, monkeypatch):
+    calls = []
+    rebuild = catalog.index.rebuild
+    monkeypatch.setattr(catalog.index, 'rebuild', lambda stocks: (calls.append(1), rebuild(stocks)))
+    return calls
+
+
+def test_other_workers_writes_are_applied_without_a_rebuild(app, monkeypatch):
+    from models import Stock
+
+    aapl, msft, orcl = add_stocks('AAPL', 'MSFT', 'ORCL')
+    catalog = StockCatalog(revalidate_seconds=0)
+    assert [stock['symbol'] for stock in catalog.all()] == ['AAPL', 'MSFT', 'ORCL']
+    rebuilds = count_rebuilds(catalog, monkeypatch)
+
+    # Writes made by another worker straight to the table
+    msft.sector = 'Cloud'
+    db.session.delete(orcl)
+    db.session.add(Stock('NVDA', 'Nvidia', sector='Technology', industry_type='Chips', price=900.0))
+    db.session.commit()
+
+    assert [stock['symbol'] for stock in catalog.all()] == ['AAPL', 'MSFT', 'NVDA']
+    assert catalog.get('MSFT')['sector'] == 'Cloud'
+    assert catalog.get('ORCL') is None and catalog.get_by_id(orcl.id) is None
+    industries = json.loads(catalog.index.public_json())['industries']
+    assert set(industries) == {'Technology', 'Cloud'}
+    assert [stock['symbol'] for stock in industries['Technology']['Software']['stocks']] == ['AAPL']
+    assert rebuilds == []
+
+
+def test_admin_crud_updates_the_catalog_in_place(app, admin_client, monkeypatch):
+    add_stocks('AAPL')
+    assert stock_catalog.get('AAPL') is not None
+    rebuilds = count_rebuilds(stock_catalog, monkeypatch)
+
+    added = admin_client.post('/admin/api/stocks', json={'symbol': 'amd', 'name': 'AMD', 'price': 100})
+    stock_id = added.get_json()['stock']['id']
+    assert stock_catalog.get('AMD')['price'] == 100.0
+
+    admin_client.put(f'/admin/api/stocks/{stock_id}/price', json={'price': 110})
+    assert stock_catalog.get_by_id(stock_id)['price'] == 110.0
+
+    admin_client.delete(f'/admin/api/stocks/{stock_id}')
+    assert stock_catalog.get('AMD') is None
+    assert [stock['symbol'] for stock in stock_catalog.all()] == ['AAPL']
+    assert rebuilds == []
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app import db
+
+
+def make_users(count):
+    from models import User
+
+    users = [User(email=f'member{i}@example.com') for i in range(count)]
+    db.session.add_all(users)
+    db.session.commit()
+    return users
+
+
+def test_batch_approve_applies_each_users_newest_request_across_chunks(app, admin_client):
+    from models import SubscriptionRequest, User
+
+    assert SubscriptionRequest.BATCH_CHUNK_SIZE < 600
+    users = make_users(600)
+    base = datetime(2026, 1, 1)
+    requests = []
+    for i, user in enumerate(users):
+        request = SubscriptionRequest(user.id, 'medium', 'free')
+        request.created_at = base + timedelta(seconds=i)
+        requests.append(request)
+    # A newer 'pro' request from the first user
+    newest = SubscriptionRequest(users[0].id, 'pro', 'free')
+    newest.created_at = base + timedelta(days=1)
+    db.session.add_all(requests + [newest])
+    db.session.commit()
+
+    # Newest request in the first chunk, the same user's older one in the last
+    ids = [newest.id] + [request.id for request in requests[1:]] + [requests[0].id]
+    response = admin_client.post('/admin/api/subscription-requests/batch', json={'ids': ids, 'action': 'approve'})
+
+    assert response.status_code == 200
+    assert len(response.get_json()['resolved_ids']) == 601
+    db.session.expire_all()
+    assert User.get(users[0].id).subscription_tier == 'pro'
+    assert User.get(users[599].id).subscription_tier == 'medium'
+    assert SubscriptionRequest.query.filter_by(status='pending').count() == 0
+
+
+def test_batch_reject_skips_unknown_and_resolved_ids(app, admin_client):
+    from models import SubscriptionRequest, User
+
+    user, = make_users(1)
+    request = SubscriptionRequest(user.id, 'pro', 'free').save()
+
+    first = admin_client.post('/admin/api/subscription-requests/batch',
+                              json={'ids': [request.id, 'missing'], 'action': 'reject'}).get_json()
+    second = admin_client.post('/admin/api/subscription-requests/batch',
+                               json={'ids': [request.id], 'action': 'reject'}).get_json()
+
+    assert first['resolved_ids'] == [request.id]
+    assert first['skipped_ids'] == ['missing']
+    assert second['skipped_ids'] == [request.id]
+    db.session.expire_all()
+    assert User.get(user.id).subscription_tier == 'free'
+
+
+def test_batch_approve_skips_requests_resolved_concurrently(app):
+    from models import SubscriptionRequest, User
+
+    first, second = make_users(2)
+    contested = SubscriptionRequest(first.id, 'pro', 'free').save()
+    other = SubscriptionRequest(second.id, 'pro', 'free').save()
+
+    fired = []
+
+    def reject_elsewhere(conn, cursor, statement, parameters, context, executemany):
+        # Another admin rejects one request after this batch started, just before its first write
+        if not fired and statement.lstrip().upper().startswith('UPDATE'):
+            fired.append(statement)
+            conn.exec_driver_sql("UPDATE subscription_requests SET status = 'rejected' WHERE id = ?",
+                                 (contested.id,))
+
+    event.listen(db.engine, 'before_cursor_execute', reject_elsewhere)
+    try:
+        resolved = SubscriptionRequest.resolve_many([contested.id, other.id], 'approve')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', reject_elsewhere)
+
+    assert resolved == [other.id]
+    db.session.expire_all()
+    assert User.get(first.id).subscription_tier == 'free'
+    assert User.get(second.id).subscription_tier == 'pro'